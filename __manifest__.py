@@ -16,6 +16,7 @@
         'security/ir.model.access.csv',
         'data/sequence.xml',
         'data/cron_jobs.xml',
+        'data/cash_summary_data.xml',
         'data/badminton_settings.xml',
         'views/res_partner_views.xml',
         'views/sport_system_views.xml',
@@ -44,12 +45,18 @@
         'views/badminton_attendance_check_views.xml',
         'views/menu_views.xml',
         'views/cash_views.xml',
+        'views/cash_export_wizard_views.xml',
+        'views/badminton_occupancy_report_views.xml',
         'reports/basketball_payment_receipt.xml',
         'reports/badminton_payment_receipt.xml',
     ],
     'assets': {
         'web.assets_backend': [
             'volan_yasamal/static/src/css/style.css',
+            'volan_yasamal/static/src/js/cash_dashboard_refresh.js',
+            'volan_yasamal/static/src/js/badminton_session_warning.js',
+            'volan_yasamal/static/src/js/badminton_reception_board.js',
+            'volan_yasamal/static/src/xml/badminton_reception_board.xml',
         ],
     },
     'demo': [],
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import os
+
+from odoo import http
+from odoo.http import request
+
+
+class CashExportController(http.Controller):
+
+    @http.route('/volan_yasamal/cash_export/<int:wizard_id>', type='http', auth='user')
+    def cash_export(self, wizard_id, **kwargs):
+        """volan.cash.export.wizard faylını diskdən axınla göndər, sonra müvəqqəti faylı sil"""
+        wizard = request.env['volan.cash.export.wizard'].browse(wizard_id).exists()
+        if not wizard:
+            raise request.not_found()
+        path, filename, mimetype = wizard._export_to_file()
+        stream = http.Stream(
+            type='path',
+            path=path,
+            mimetype=mimetype,
+            download_name=filename,
+            size=os.path.getsize(path),
+        )
+        response = stream.get_response(as_attachment=True)
+        response.call_on_close(lambda: os.path.exists(path) and os.unlink(path))
+        return response
@@ -25,8 +25,13 @@ from . import sport_system
 from . import session_extend_wizard
 from . import badminton_attendance_check
 from . import cash
+from . import cash_metrics_cache
 from . import badminton_session_filter
 from . import badminton_product
 from . import badminton_product_sale
 from . import badminton_stock_movement
-from . import badminton_stock_update_wizard
\ No newline at end of file
+from . import badminton_stock_update_wizard
+from . import cash_export_wizard
+from . import benchmark
+from . import badminton_court_occupancy
+from . import badminton_occupancy_report
\ No newline at end of file
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+
+OCCUPYING_STATES = ('active', 'extended')
+
+
+class BadmintonCourtOccupancy(models.Model):
+    """Zalın canlı doluluq sayğacı.
+
+    Hər zal üçün bir sətir: aktiv/uzadılmış sessiyaların sayı burada saxlanılır və sessiya
+    başladılanda, tamamlananda və ya ləğv ediləndə artırılıb-azaldılır (yenidən sayılmır).
+    Qəbul sətir kilidi ilə (SELECT ... FOR UPDATE) seriallaşdırılır, ona görə iki resepsiya
+    eyni anda sessiya başlatsa da zal kapasitetdən artıq dolmur.
+    """
+    _name = 'badminton.court.occupancy'
+    _description = 'Badminton Zal Doluluğu'
+
+    code = fields.Char(string="Zal", required=True, readonly=True)
+    active_count = fields.Integer(string="Aktiv Sessiyalar", default=0, readonly=True)
+
+    _sql_constraints = [
+        ('code_unique', 'UNIQUE(code)', 'Hər zal üçün yalnız bir doluluq sayğacı ola bilər!'),
+    ]
+
+    _DEFAULT_CODE = 'main'
+
+    @api.model
+    def _get_max_capacity(self):
+        """Zal kapasiteti - System Parameter-dən oxunur (get_param keşlənir)"""
+        capacity = self.env['ir.config_parameter'].sudo().get_param(
+            'volan_yasamal.badminton_court_capacity',
+            default='8'
+        )
+        return int(capacity)
+
+    @api.model
+    def _count_occupying_sessions(self):
+        self.env['badminton.session'].flush_model(['state'])
+        self.env.cr.execute("SELECT COUNT(*) FROM badminton_session WHERE state IN %s", (OCCUPYING_STATES,))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_counter_id(self, code=None):
+        """Sayğac sətrinin id-si; yoxdursa faktiki say ilə yaradılır"""
+        code = code or self._DEFAULT_CODE
+        self.env.cr.execute("SELECT id FROM badminton_court_occupancy WHERE code = %s", (code,))
+        row = self.env.cr.fetchone()
+        if row:
+            return row[0]
+        self.env.cr.execute("""
+            INSERT INTO badminton_court_occupancy (code, active_count, create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+            ON CONFLICT (code) DO NOTHING
+            RETURNING id
+        """, (code, self._count_occupying_sessions(), self.env.uid, self.env.uid))
+        row = self.env.cr.fetchone()
+        if row:
+            return row[0]
+        return self._get_counter_id(code)
+
+    @api.model
+    def _lock(self, code=None):
+        """Sayğac sətrini tranzaksiyanın sonuna qədər kilidlə; (id, aktiv say) qaytarır.
+
+        Paralel tranzaksiya burada gözləyir; Odoo-nun REPEATABLE READ izolyasiyasında o
+        serialization xətası alır və sorğu avtomatik təkrarlanır (yeni say ilə).
+        """
+        counter_id = self._get_counter_id(code)
+        self.env.cr.execute("SELECT active_count FROM badminton_court_occupancy WHERE id = %s FOR UPDATE",
+                            (counter_id,))
+        return counter_id, self.env.cr.fetchone()[0]
+
+    @api.model
+    def check_admission(self, seats=1, code=None):
+        """Kilidi al və yer olub-olmadığını yoxla (sessiya başlamazdan əvvəl)"""
+        _counter_id, active_count = self._lock(code)
+        max_capacity = self._get_max_capacity()
+        if active_count + seats > max_capacity:
+            raise ValidationError(
+                f'⚠️ Zal doludur!\n'
+                f'Aktiv sessiyalar: {active_count}/{max_capacity}\n'
+                f'Zəhmət olmasa bir sessiya tamamlanana qədər gözləyin.'
+            )
+        return active_count
+
+    @api.model
+    def _apply_delta(self, delta, code=None):
+        """Sayğacı delta qədər dəyiş; artım kapasiteti keçərsə ValidationError"""
+        if not delta:
+            return
+        if delta > 0:
+            self.check_admission(delta, code)
+        counter_id = self._get_counter_id(code)
+        self.env.cr.execute("""
+            UPDATE badminton_court_occupancy
+               SET active_count = GREATEST(active_count + %s, 0),
+                   write_uid = %s, write_date = now() at time zone 'UTC'
+             WHERE id = %s
+        """, (delta, self.env.uid, counter_id))
+        self.invalidate_model(['active_count'])
+
+    @api.model
+    def get_occupancy(self, code=None):
+        """Resepsiya üçün: {'active': .., 'capacity': .., 'free': ..} - sayma sorğusu olmadan"""
+        self.env.cr.execute("SELECT active_count FROM badminton_court_occupancy WHERE id = %s",
+                            (self._get_counter_id(code),))
+        active_count = self.env.cr.fetchone()[0]
+        max_capacity = self._get_max_capacity()
+        return {'active': active_count, 'capacity': max_capacity, 'free': max(max_capacity - active_count, 0)}
+
+    @api.model
+    def recount(self, code=None):
+        """Sayğacı faktiki aktiv sessiya sayı ilə düzəlt (cron / əl ilə)"""
+        counter_id, active_count = self._lock(code)
+        actual = self._count_occupying_sessions()
+        if actual != active_count:
+            self.env.cr.execute("UPDATE badminton_court_occupancy SET active_count = %s WHERE id = %s",
+                                (actual, counter_id))
+            self.invalidate_model(['active_count'])
+        return actual
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import create_index
+from datetime import timedelta
+import logging
+import pytz
+
+_logger = logging.getLogger(__name__)
+
+WEEKDAY_SELECTION = [
+    ('1', 'Bazar ertəsi'),
+    ('2', 'Çərşənbə axşamı'),
+    ('3', 'Çərşənbə'),
+    ('4', 'Cümə axşamı'),
+    ('5', 'Cümə'),
+    ('6', 'Şənbə'),
+    ('7', 'Bazar'),
+]
+
+
+class BadmintonOccupancyReport(models.Model):
+    """Zalın saatlıq doluluq hesabatı (heatmap).
+
+    Sessiyalar generate_series ilə start_time..end_time arasındakı saatlara açılır və
+    (saat, tətbiq, ödəniş növü) üzrə toplanmış şəkildə bu cədvəldə saxlanılır. Cədvəl
+    yalnız son günlər üçün yenilənir (refresh), tam yenidən qurma üçün rebuild().
+    """
+    _name = 'badminton.occupancy.report'
+    _description = 'Badminton Zal Doluluğu Hesabatı'
+    _order = 'bucket desc'
+    _rec_name = 'bucket'
+
+    bucket = fields.Datetime(string="Saat", readonly=True, required=True)
+    # date / weekday / hour zalın yerli vaxtı ilə (bucket isə Odoo kimi UTC-də saxlanılır)
+    date = fields.Date(string="Tarix", readonly=True, required=True)
+    weekday = fields.Selection(WEEKDAY_SELECTION, string="Həftə Günü", readonly=True)
+    hour = fields.Integer(string="Saat (0-23)", readonly=True, aggregator=False)
+    promo_type = fields.Selection([
+        ('1fit', '1FIT'),
+        ('push30', 'PUSH30'),
+        ('push30_plus', 'PUSH30+'),
+        ('tripsome', 'Tripsome')
+    ], string="Tətbiq", readonly=True)
+    payment_type = fields.Selection([
+        ('cash', 'Nağd'),
+        ('card', 'Kartdan karta'),
+        ('abonent', 'Abunəçi'),
+    ], string="Ödəniş Növü", readonly=True)
+    session_count = fields.Integer(string="Sessiya Sayı", readonly=True)
+    occupied_hours = fields.Float(string="Dolu Saat", readonly=True,
+                                  help="Saat ərzində sessiyaların zalda keçirdiyi ümumi vaxt (saat)")
+
+    _DEFAULT_REFRESH_DAYS = 2
+    _DEFAULT_TZ = 'Asia/Baku'
+
+    def init(self):
+        create_index(self.env.cr, 'badminton_occupancy_report_date_idx',
+                     self._table, ['date', 'hour'])
+        # İlk quraşdırmada (və ya boş cədvəldə) bütün tarixi doldur
+        self.env.cr.execute("SELECT 1 FROM badminton_occupancy_report LIMIT 1")
+        if not self.env.cr.fetchone():
+            self.rebuild()
+
+    @api.model
+    def _get_tz(self):
+        """Zalın saat qurşağı - istifadəçidən asılı deyil, bütün hesabat bir qurşaqda saxlanılır.
+
+        System Parameter: volan_yasamal.hall_timezone (dəyişdikdən sonra rebuild() lazımdır).
+        """
+        tz = self.env['ir.config_parameter'].sudo().get_param(
+            'volan_yasamal.hall_timezone', default=self._DEFAULT_TZ)
+        if tz not in pytz.all_timezones_set:
+            _logger.warning("Naməlum zal saat qurşağı %r, %s istifadə olunur", tz, self._DEFAULT_TZ)
+            return self._DEFAULT_TZ
+        return tz
+
+    @api.model
+    def _refresh_since(self, since=None):
+        """since (yerli saat) və ondan sonrakı saatları yenidən hesabla; since=None - hamısı"""
+        self.env['badminton.session'].flush_model(
+            ['state', 'start_time', 'end_time', 'completion_time', 'promo_type', 'payment_type'])
+        cr = self.env.cr
+        tz = self._get_tz()
+        if since:
+            cr.execute("""
+                DELETE FROM badminton_occupancy_report
+                 WHERE bucket >= (%s::timestamp AT TIME ZONE %s AT TIME ZONE 'UTC')
+            """, (since, tz))
+        else:
+            cr.execute("DELETE FROM badminton_occupancy_report")
+        cr.execute("""
+            WITH sessions AS (
+                SELECT s.promo_type, s.payment_type,
+                       (s.start_time AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s) AS local_start,
+                       (LEAST(s.end_time, COALESCE(s.completion_time, s.end_time))
+                            AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s) AS local_end
+                  FROM badminton_session s
+                 WHERE s.state IN ('active', 'extended', 'completed')
+                   AND s.start_time IS NOT NULL
+                   AND s.end_time > s.start_time
+                   AND (%(since)s::timestamp IS NULL
+                        OR (s.end_time AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s) > %(since)s::timestamp)
+            ), buckets AS (
+                SELECT b.bucket, s.promo_type, s.payment_type,
+                       EXTRACT(EPOCH FROM LEAST(s.local_end, b.bucket + interval '1 hour')
+                                          - GREATEST(s.local_start, b.bucket)) / 3600.0 AS occupied
+                  FROM sessions s,
+                       generate_series(date_trunc('hour', s.local_start),
+                                       s.local_end - interval '1 second',
+                                       interval '1 hour') AS b(bucket)
+                 WHERE s.local_end > s.local_start
+            )
+            INSERT INTO badminton_occupancy_report
+                (bucket, date, weekday, hour, promo_type, payment_type, session_count, occupied_hours,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT bucket AT TIME ZONE %(tz)s AT TIME ZONE 'UTC', bucket::date,
+                   EXTRACT(ISODOW FROM bucket)::int::text, EXTRACT(HOUR FROM bucket)::int,
+                   promo_type, payment_type, COUNT(*), SUM(occupied),
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM buckets
+             WHERE %(since)s::timestamp IS NULL OR bucket >= %(since)s::timestamp
+          GROUP BY bucket, promo_type, payment_type
+        """, {'tz': tz, 'since': since, 'uid': self.env.uid})
+        self.invalidate_model()
+        return cr.rowcount
+
+    @api.model
+    def refresh(self, days=None):
+        """Yalnız son günləri yenilə (cron); köhnə saatlar dəyişmir"""
+        days = self._DEFAULT_REFRESH_DAYS if days is None else days
+        self.env.cr.execute("SELECT date_trunc('day', now() AT TIME ZONE %s)", (self._get_tz(),))
+        since = self.env.cr.fetchone()[0] - timedelta(days=max(days - 1, 0))
+        rows = self._refresh_since(since)
+        _logger.info("Doluluq hesabatı yeniləndi: %s-dən bəri %s sətir", since, rows)
+        return True
+
+    @api.model
+    def rebuild(self):
+        """Bütün tarixi yenidən qur (ilk quraşdırma / düzəliş)"""
+        rows = self._refresh_since(None)
+        _logger.info("Doluluq hesabatı tam yenidən quruldu: %s sətir", rows)
+        return True
+
+    @api.model
+    def action_refresh(self):
+        self.refresh()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
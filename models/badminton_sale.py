@@ -66,6 +66,9 @@ class BadmintonSale(models.Model):
     
     # Qeydlər
     notes = fields.Text(string="Qeydlər")
+
+    # Ümumi Qalığa (kassa checkpoint-lərinə) təsir edən sahələr
+    _CASH_BALANCE_FIELDS = {'state', 'payment_date', 'amount_paid', 'payment_method'}
     
     @api.depends('sale_date', 'package_type')
     def _compute_expiry_date(self):
@@ -149,7 +152,22 @@ class BadmintonSale(models.Model):
             sale._add_hours_to_customer()
             sale.credited_hours = sale.hours_quantity
             
+        sale._invalidate_cash_checkpoints()
         return sale
+
+    def write(self, vals):
+        """Ödənilmiş satış dəyişəndə bağlanmış ayların kassa checkpoint-lərini sıfırla"""
+        affects_balance = bool(self._CASH_BALANCE_FIELDS.intersection(vals))
+        if affects_balance:
+            self._invalidate_cash_checkpoints()
+        res = super(BadmintonSale, self).write(vals)
+        if affects_balance:
+            self._invalidate_cash_checkpoints()
+        return res
+
+    def _invalidate_cash_checkpoints(self):
+        """Bağlanmış aya düşən ödənişli satışlar üçün aylıq kassa checkpoint-lərini sıfırla"""
+        self.env['volan.cash.checkpoint']._invalidate('badminton', self.mapped('payment_date'))
     
     def action_confirm(self):
         """Satışı təsdiqləyir"""
@@ -200,17 +218,10 @@ class BadmintonSale(models.Model):
     
     def unlink(self):
         """Satış silinərkən əlaqəli kassa əməliyyatını da sil"""
-        # Əvvəlcə kassa əməliyyatlarını tap və sil
-        for sale in self:
-            cash_flows = self.env['volan.cash.flow'].search([
-                ('related_model', '=', 'badminton.sale'),
-                ('related_id', '=', sale.id)
-            ])
-            if cash_flows:
-                # related_model-i sıfırla ki, unlink qadağası işləməsin
-                cash_flows.write({'related_model': False, 'related_id': False})
-                cash_flows.unlink()
-        
+        self._invalidate_cash_checkpoints()
+        # Əvvəlcə kassa əməliyyatlarını bir sorğu ilə tap və sil
+        self.env['volan.cash.flow']._unlink_for_sources('badminton.sale', self.ids)
+
         return super(BadmintonSale, self).unlink()
     
     def _add_hours_to_customer(self):
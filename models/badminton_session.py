@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools import create_index, SQL
+from .badminton_court_occupancy import OCCUPYING_STATES
 from datetime import timedelta
+from markupsafe import Markup
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Resepsiya bildirişləri (xəbərdarlıqlar, sessiya dəyişiklikləri) yalnız bu qrupların
+# bus kanallarına göndərilir; üzvlər kanala avtomatik qoşulur
+RECEPTION_GROUP_XMLIDS = ('volan_yasamal.group_volan_nezaretci', 'volan_yasamal.group_volan_admin')
+
 
 class BadmintonSession(models.Model):
     _name = 'badminton.session'
@@ -48,13 +55,20 @@ class BadmintonSession(models.Model):
     notes = fields.Text(string="Qeydlər")
     time_expired = fields.Boolean(string="Vaxt Bitib", compute="_compute_time_expired", store=False)
     completion_time = fields.Datetime(string="Tamamlanma Vaxtı")
-    recently_completed = fields.Boolean(string="Son Tamamlanan", compute="_compute_recently_completed", store=True)
+    recently_completed = fields.Boolean(string="Son Tamamlanan", compute="_compute_recently_completed",
+                                        search="_search_recently_completed")
     session_package_id = fields.Many2one(
         'badminton.monthly.balance',
         string="Abunəlik Paketi",
-        domain="[('partner_id', '=', partner_id), ('state', '=', 'active'), ('remaining_units', '>', 0)]",
+        domain="[('id', 'in', available_package_ids)]",
         help="Sessiya üçün istifadə ediləcək aylıq paket balansi"
     )
+    available_package_ids = fields.Many2many(
+        'badminton.monthly.balance',
+        string="Aktiv Paketlər",
+        compute="_compute_has_package",
+        help="Müştərinin aktiv və balansı qalan paketləri (paket seçimi üçün)"
+    )
     has_package = fields.Boolean(
         string="Paket Var",
         compute="_compute_has_package",
@@ -69,6 +83,23 @@ class BadmintonSession(models.Model):
     # one-time flag, чтобы не спамить одно и то же окончание
     warn10_sent = fields.Boolean(string="5 dəq xəbərdarlığı göndərilib", default=False, index=True)
 
+    def init(self):
+        # Kassa giriş hesabatı: tamamlanmış sessiyalar start_time intervalı üzrə
+        create_index(self.env.cr, 'badminton_session_state_start_time_idx',
+                     self._table, ['state', 'start_time'])
+        # Növbə: gözləmədə olan sessiyalar yaradılma sırası ilə
+        create_index(self.env.cr, 'badminton_session_state_created_at_idx',
+                     self._table, ['state', 'created_at'])
+        # Son tamamlananlar: sorğu anında completion_time üzrə
+        create_index(self.env.cr, 'badminton_session_state_completion_time_idx',
+                     self._table, ['state', 'completion_time'])
+        # Köhnə dəqiqəlik cron-lar hadisə əsaslı planlayıcı ilə əvəz olunub (noupdate qeydlər)
+        for xmlid in ('volan_yasamal.ir_cron_auto_complete_badminton_sessions',
+                      'volan_yasamal.ir_cron_badminton_session_warning'):
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron and cron.active:
+                cron.active = False
+
     # ---------- computed ----------
     @api.depends('end_time', 'state')
     def _compute_time_expired(self):
@@ -76,71 +107,104 @@ class BadmintonSession(models.Model):
         for r in self:
             r.time_expired = bool(r.end_time and r.state in ('active', 'extended') and now > r.end_time)
 
+    # "Son tamamlanan" pəncərəsi (dəqiqə); sorğu anında completion_time indeksi ilə yoxlanılır
+    _RECENTLY_COMPLETED_MINUTES = 15
+
     @api.depends('state', 'completion_time')
     def _compute_recently_completed(self):
-        now = fields.Datetime.now()
+        limit_dt = fields.Datetime.now() - timedelta(minutes=self._RECENTLY_COMPLETED_MINUTES)
         for r in self:
-            if r.state == 'completed' and r.completion_time:
-                r.recently_completed = (now - r.completion_time).total_seconds() < 900
-            else:
-                r.recently_completed = False
+            r.recently_completed = bool(r.state == 'completed' and r.completion_time
+                                        and r.completion_time > limit_dt)
+
+    def _search_recently_completed(self, operator, value):
+        if operator not in ('=', '!='):
+            return NotImplemented
+        domain = [
+            ('state', '=', 'completed'),
+            ('completion_time', '>', fields.Datetime.now() - timedelta(minutes=self._RECENTLY_COMPLETED_MINUTES)),
+        ]
+        if (operator == '=') == bool(value):
+            return domain
+        return ['!', '&'] + domain
     
     @api.depends('partner_id')
     def _compute_has_package(self):
-        """Müştərinin aktiv paket sənədi olub-olmadığını yoxla"""
+        """Aktiv paketləri bütün qeydlər üçün bir qruplaşdırılmış sorğu ilə tap"""
+        partners = self.partner_id
+        packages_by_partner = {}
+        if partners:
+            groups = self.env['badminton.monthly.balance']._read_group(
+                [('partner_id', 'in', partners.ids), ('state', '=', 'active'), ('remaining_units', '>', 0)],
+                groupby=['partner_id'],
+                aggregates=['id:recordset'],
+            )
+            packages_by_partner = {partner.id: packages for partner, packages in groups}
+        empty = self.env['badminton.monthly.balance']
         for rec in self:
-            if rec.partner_id:
-                package_count = self.env['badminton.monthly.balance'].search_count([
-                    ('partner_id', '=', rec.partner_id.id),
-                    ('state', '=', 'active'),
-                    ('remaining_units', '>', 0)
-                ])
-                rec.has_package = package_count > 0
-            else:
-                rec.has_package = False
+            packages = packages_by_partner.get(rec.partner_id.id, empty)
+            rec.available_package_ids = packages
+            rec.has_package = bool(packages)
     
     def _compute_queue_number(self):
-        """Gözləmədə olan sessiyalar üçün növbə nömrəsini hesabla"""
+        """Gözləmədə olan sessiyalar üçün növbə nömrəsini bir sorğu ilə hesabla"""
+        positions = self._get_queue_positions()
         for rec in self:
-            if rec.state == 'draft':
-                # Gözləmədə olan və bu sessiyadan əvvəl yaradılmış sessiyaları say
-                queue_position = self.search_count([
-                    ('state', '=', 'draft'),
-                    ('created_at', '<', rec.created_at),
-                    ('id', '!=', rec.id)
-                ])
-                rec.queue_number = queue_position + 1
-            else:
-                rec.queue_number = 0
-    
+            rec.queue_number = positions.get(rec.id, 0) if rec.state == 'draft' else 0
+
+    def _get_queue_positions(self):
+        """{session_id: növbə} - ROW_NUMBER (state, created_at) indeksi üzərindən"""
+        self.flush_model(['state', 'created_at'])
+        ids = self.ids if self else None
+        query = """
+            SELECT id, position FROM (
+                SELECT id, ROW_NUMBER() OVER (ORDER BY created_at, id) AS position
+                  FROM badminton_session
+                 WHERE state = 'draft'
+            ) queue
+        """
+        if ids is not None:
+            record_ids = [rid for rid in ids if isinstance(rid, int)]
+            if not record_ids:
+                return {}
+            self.env.cr.execute(query + " WHERE id IN %s", (tuple(record_ids),))
+        else:
+            self.env.cr.execute(query + " ORDER BY position")
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def get_queue(self):
+        """Resepsiya ekranı üçün bütün növbə: sıra ilə [{'id', 'name', 'partner_name', 'queue_number', ...}]"""
+        positions = self.browse()._get_queue_positions()
+        sessions = self.browse(list(positions))
+        return [{
+            'id': session['id'],
+            'name': session['name'],
+            'partner_id': session['partner_id'][0] if session['partner_id'] else False,
+            'partner_name': session['partner_id'][1] if session['partner_id'] else '',
+            'created_at': fields.Datetime.to_string(session['created_at']),
+            'duration_hours': session['duration_hours'],
+            'queue_number': positions[session['id']],
+        } for session in sessions.read(['name', 'partner_id', 'created_at', 'duration_hours'])]
+
     def _get_max_capacity(self):
         """Zal kapasiteti - System Parameter-dən oxunur"""
-        capacity = self.env['ir.config_parameter'].sudo().get_param(
-            'volan_yasamal.badminton_court_capacity', 
-            default='8'
-        )
-        return int(capacity)
+        return self.env['badminton.court.occupancy'].sudo()._get_max_capacity()
     
     def _get_active_sessions_count(self):
-        """Hal-hazırda aktiv və uzadılmış sessiyaların sayı"""
-        return self.search_count([
-            ('state', 'in', ['active', 'extended'])
-        ])
+        """Hal-hazırda aktiv və uzadılmış sessiyaların sayı (canlı sayğacdan)"""
+        return self.env['badminton.court.occupancy'].sudo().get_occupancy()['active']
     
     def _check_capacity(self):
-        """Zal kapasitetini yoxla"""
-        active_count = self._get_active_sessions_count()
-        max_capacity = self._get_max_capacity()
-        
-        if active_count >= max_capacity:
-            raise ValidationError(
-                f'⚠️ Zal doludur!\n'
-                f'Aktiv sessiyalar: {active_count}/{max_capacity}\n'
-                f'Zəhmət olmasa bir sessiya tamamlanana qədər gözləyin.'
-            )
-        
+        """Zal kapasitetini yoxla - sayğac kilidlənir, paralel başlatmalar bir-birini gözləyir"""
+        self.env['badminton.court.occupancy'].sudo().check_admission()
         return True
 
+    def _occupancy_delta(self, new_state):
+        """Bu qeydlər new_state-ə keçəndə zal doluluğunun dəyişməsi"""
+        occupying = new_state in OCCUPYING_STATES
+        return sum(int(occupying) - int(rec.state in OCCUPYING_STATES) for rec in self)
+
     # ---------- lifecycle ----------
     @api.model_create_multi
     def create(self, vals_list):
@@ -160,14 +224,41 @@ class BadmintonSession(models.Model):
             # Yalnız sessiya başladılanda set ediləcək
         
         records = super().create(vals_list)
+        occupying = records.filtered(lambda r: r.state in OCCUPYING_STATES)
+        if occupying:
+            self.env['badminton.court.occupancy'].sudo()._apply_delta(len(occupying))
+            self._schedule_session_events_on_commit()
+        records._notify_reception_on_commit()
         return records
 
     def write(self, vals):
+        # Canlı doluluq sayğacı: başlama / tamamlama / ləğv zamanı artır-azalt
+        occupancy_delta = self._occupancy_delta(vals['state']) if 'state' in vals else 0
+        if occupancy_delta > 0:
+            self.env['badminton.court.occupancy'].sudo()._apply_delta(occupancy_delta)
         res = super().write(vals)
+        if occupancy_delta < 0:
+            self.env['badminton.court.occupancy'].sudo()._apply_delta(occupancy_delta)
+        # Giriş statistikası (badminton.cash.balance) tamamlanmış sessiyalardan hesablanır
+        if {'state', 'start_time', 'payment_type', 'promo_type'}.intersection(vals):
+            self.env['volan.cash.metrics.cache']._bump_data_version()
         # при изменении конца сессии заново разрешаем предупреждение
         if 'end_time' in vals:
             for rec in self.filtered(lambda r: r.state in ('active', 'extended')):
                 rec.warn10_sent = False
+        # Başlama / uzatma / tamamlama: növbəti bitmə və ya xəbərdarlıq anını yenidən planla
+        if {'state', 'end_time'}.intersection(vals):
+            self._schedule_session_events_on_commit()
+        if self._RECEPTION_FIELDS.intersection(vals):
+            self._notify_reception_on_commit()
+        return res
+
+    def unlink(self):
+        occupying = self.filtered(lambda r: r.state in OCCUPYING_STATES)
+        self._notify_reception_on_commit()
+        res = super().unlink()
+        if occupying:
+            self.env['badminton.court.occupancy'].sudo()._apply_delta(-len(occupying))
         return res
 
     @api.onchange('partner_id')
@@ -186,7 +277,7 @@ class BadmintonSession(models.Model):
             self.duration_hours = 1.0
 
     # ---------- helpers / flows ----------
-    def _deduct_balance_on_start(self):
+    def _deduct_balance_on_start(self, check_active=True):
         """Sessiya başladıqda balansı azaldır - daxili helper metod"""
         self.ensure_one()
         
@@ -200,13 +291,14 @@ class BadmintonSession(models.Model):
 
         required_hours = float(self.duration_hours)
 
-        active = self.search([
-            ('partner_id', '=', self.partner_id.id),
-            ('state', 'in', ['active', 'extended']),
-            ('id', '!=', self.id)
-        ], limit=1)
-        if active:
-            raise ValidationError(f'{self.partner_id.name} üçün artıq aktiv sessiya var!')
+        if check_active:
+            active = self.search([
+                ('partner_id', '=', self.partner_id.id),
+                ('state', 'in', ['active', 'extended']),
+                ('id', '!=', self.id)
+            ], limit=1)
+            if active:
+                raise ValidationError(f'{self.partner_id.name} üçün artıq aktiv sessiya var!')
 
         if self.session_package_id:
             self._consume_selected_package(required_hours, 'usage', f"Sessiya başladıldı: {self.name}")
@@ -248,15 +340,94 @@ class BadmintonSession(models.Model):
             'tag': 'reload',
         }
 
+    def start_next_from_queue(self, count=None):
+        """Növbədən bir neçə sessiyanı birlikdə başlat (qrup gəlişi - bir sorğu).
+
+        Zal kilidlənir, boş yer sayı qədər (və ya count) sessiya növbə sırası ilə seçilir.
+        Balanslar bütün partiya üçün əvvəlcədən yüklənmiş məlumatla yoxlanılır; balansı
+        çatmayan və ya artıq aktiv sessiyası olan müştərilər ötürülür. Seçilmiş qeydlər
+        varsa yalnız onlar, yoxdursa bütün növbə nəzərə alınır.
+        """
+        occupancy = self.env['badminton.court.occupancy'].sudo()
+        active_count = occupancy.check_admission(0)
+        free_seats = occupancy._get_max_capacity() - active_count
+        if count:
+            free_seats = min(free_seats, count)
+        if free_seats <= 0:
+            raise ValidationError('⚠️ Zal doludur! Növbədən sessiya başlatmaq mümkün deyil.')
+
+        positions = self.browse()._get_queue_positions()
+        queue = self.browse(sorted(positions, key=positions.get))
+        if self:
+            queue = queue & self
+
+        # Partiya üçün məlumatı bir dəfəyə yüklə: müştərilər, aylıq paketlər, aktiv sessiyalar
+        partners = queue.partner_id
+        partners.mapped('badminton_balance')
+        partners.monthly_balance_ids.mapped('remaining_units')
+        busy_partner_ids = set(self.search([
+            ('partner_id', 'in', partners.ids),
+            ('state', 'in', OCCUPYING_STATES),
+        ]).partner_id.ids)
+        available = {partner.id: partner.get_total_badminton_hours_available() for partner in partners}
+
+        to_start = self.browse()
+        skipped = []
+        for session in queue:
+            if len(to_start) >= free_seats:
+                break
+            partner = session.partner_id
+            if partner.id in busy_partner_ids:
+                skipped.append(f"{partner.name}: artıq aktiv sessiya var")
+                continue
+            if not session.promo_type:
+                if session.session_package_id:
+                    if session.session_package_id.get_hours_available() < session.duration_hours:
+                        skipped.append(f"{partner.name}: seçilən paketdə balans kifayət deyil")
+                        continue
+                elif available[partner.id] < session.duration_hours:
+                    skipped.append(f"{partner.name}: balans kifayət deyil")
+                    continue
+                else:
+                    available[partner.id] -= session.duration_hours
+            busy_partner_ids.add(partner.id)
+            to_start |= session
+
+        for session in to_start:
+            session._deduct_balance_on_start(check_active=False)
+        # Eyni müddətli sessiyalar bir write ilə başladılır
+        now = fields.Datetime.now()
+        for duration, sessions in to_start.grouped('duration_hours').items():
+            sessions.write({
+                'start_time': now,
+                'end_time': now + timedelta(hours=duration),
+                'state': 'active',
+                'warn10_sent': False,
+            })
+
+        message = f"{len(to_start)} sessiya başladıldı: {', '.join(to_start.partner_id.mapped('name')) or '-'}"
+        if skipped:
+            message += "\nÖtürüldü: " + "; ".join(skipped)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Növbədən başlatma',
+                'message': message,
+                'type': 'success' if to_start else 'warning',
+                'sticky': bool(skipped),
+                'next': {'type': 'ir.actions.client', 'tag': 'reload'},
+            },
+        }
+
     def start_session_by_qr(self, qr_data):
         try:
-            if "ID:" not in qr_data or "NAME:" not in qr_data:
+            partner = self.env['res.partner']._resolve_qr_payload(qr_data)
+            if partner is None:
                 return {'status': 'error', 'message': 'QR kod formatı səhvdir!'}
-
-            partner_id = int(qr_data.split("ID:")[1].split("-")[0])
-            partner = self.env['res.partner'].browse(partner_id)
-            if not partner.exists():
+            if not partner:
                 return {'status': 'error', 'message': 'Müştəri tapılmadı!'}
+            partner_id = partner.id
 
             monthly_hours = partner.get_monthly_hours_available()
             normal_balance = partner.badminton_balance or 0.0
@@ -295,39 +466,69 @@ class BadmintonSession(models.Model):
             return {'status': 'error', 'message': f'Xəta baş verdi: {str(e)}'}
 
     def extend_session(self, additional_hours=1.0):
-        for s in self.filtered(lambda r: r.state in ('active', 'extended')):
+        """Bir və ya bir neçə sessiyanı (məs. bütün kort qrupu) birlikdə uzat.
 
-            # PROMO sessiya: balans çıxma, sadəcə vaxtı uzat
+        Balans hər sessiya üçün ayrıca çıxılır (tarixçə sessiyaya bağlanır), yeni dəyərlər
+        əvvəlcədən hesablanır və bütün sessiyalara bir UPDATE ilə yazılır. UPDATE ORM-dən yan keçdiyi üçün yazma
+        hüquqları balans çıxılmazdan əvvəl yoxlanılır.
+        """
+        sessions = self.filtered(lambda r: r.state in OCCUPYING_STATES)
+        if not sessions:
+            return
+        sessions.check_access('write')
+
+        # normal flow (balans çıx); PROMO sessiyalarda balans çıxılmır
+        paid = sessions.filtered(lambda r: not r.promo_type)
+        for s in paid.filtered('session_package_id'):
+            s._consume_selected_package(
+                additional_hours, 'extension',
+                f"Sessiya uzadıldı: {s.name} (+{additional_hours} saat)"
+            )
+        # hər sessiya öz balans tarixçəsi sətrini alır (session=s), ona görə müştəri üzrə birləşdirilmir
+        for s in paid.filtered(lambda r: not r.session_package_id):
+            s.partner_id.consume_genclik_badminton_hours(
+                additional_hours,
+                transaction_type='extension',
+                description=f"Sessiya uzadıldı: {s.name} (+{additional_hours} saat)",
+                session=s
+            )
+
+        balances = {
+            partner.id: (partner.get_monthly_hours_available(), partner.badminton_balance)
+            for partner in paid.partner_id
+        }
+        notes = []
+        for s in sessions:
             if s.promo_type:
-                s.extended_time += additional_hours
-                s.end_time = s.end_time + timedelta(hours=additional_hours)
-                s.state = 'extended'
-                s.notes = (f"Promo sessiya uzadıldı (+{additional_hours} saat). "
+                note = (f"Promo sessiya uzadıldı (+{additional_hours} saat). "
                         f"Tətbiq: {s.promo_type}. Balans çıxılmadı.")
-                s.warn10_sent = False
-                continue
-
-            # normal flow (balans çıx)
-            if s.session_package_id:
-                s._consume_selected_package(
-                    additional_hours, 'extension',
-                    f"Sessiya uzadıldı: {s.name} (+{additional_hours} saat)"
-                )
             else:
-                s.partner_id.consume_genclik_badminton_hours(
-                    additional_hours,
-                    transaction_type='extension',
-                    description=f"Sessiya uzadıldı: {s.name} (+{additional_hours} saat)",
-                    session=s
-                )
-
-            s.extended_time += additional_hours
-            s.end_time = s.end_time + timedelta(hours=additional_hours)
-            s.state = 'extended'
-            s.notes = (f"Sessiya {additional_hours} saat uzadıldı. "
-                    f"Aylıq balans: {s.partner_id.get_monthly_hours_available()} saat | "
-                    f"Normal balans: {s.partner_id.badminton_balance}")
-            s.warn10_sent = False
+                monthly_hours, normal_balance = balances[s.partner_id.id]
+                note = (f"Sessiya {additional_hours} saat uzadıldı. "
+                        f"Aylıq balans: {monthly_hours} saat | "
+                        f"Normal balans: {normal_balance}")
+            notes.append(SQL("(%s, %s)", s.id, note))
+
+        self.flush_model(['extended_time', 'end_time', 'state', 'notes', 'warn10_sent'])
+        self.env.cr.execute(SQL("""
+            UPDATE badminton_session AS session
+               SET extended_time = COALESCE(session.extended_time, 0) + %(hours)s,
+                   end_time = session.end_time + %(hours)s * interval '1 hour',
+                   state = 'extended',
+                   notes = extension.note,
+                   warn10_sent = FALSE,
+                   write_uid = %(uid)s,
+                   write_date = now() at time zone 'UTC'
+              FROM (VALUES %(values)s) AS extension (id, note)
+             WHERE session.id = extension.id
+        """, hours=additional_hours, uid=self.env.uid, values=SQL(", ").join(notes)))
+
+        fnames = ['extended_time', 'end_time', 'state', 'notes', 'warn10_sent', 'write_uid', 'write_date']
+        sessions.invalidate_recordset(fnames)
+        sessions.modified(fnames)
+        self.env['volan.cash.metrics.cache']._bump_data_version()
+        sessions._schedule_session_events_on_commit()
+        sessions._notify_reception_on_commit()
 
     def _consume_selected_package(self, hours, transaction_type, description):
         self.ensure_one()
@@ -367,18 +568,127 @@ class BadmintonSession(models.Model):
             'res_model': 'badminton.session.extend.wizard',
             'view_mode': 'form',
             'target': 'new',
-            'context': {'default_session_id': self.id}
+            'context': {'default_session_id': self[:1].id, 'default_session_ids': self.ids}
         }
 
     def complete_session(self):
-        for s in self.filtered(lambda r: r.state in ('active', 'extended')):
-            s.write({
-                'state': 'completed',
-                'completion_time': fields.Datetime.now(),
-                'notes': (f"Sessiya tamamlandı: {fields.Datetime.now()}. "
-                          f"İstifadə edilən saat: {s.duration_hours + s.extended_time}")
-            })
+        self._complete_sessions_bulk(with_notes=True)
+
+    def _complete_sessions_bulk(self, domain=None, with_notes=False):
+        """Aktiv/uzadılmış sessiyaları bir UPDATE ilə tamamla.
+
+        completion_time hər sətir üçün SQL-də yazılır, sonra asılı hesablamalar, doluluq
+        sayğacı və keş bir dəfə yenilənir. with_notes=True (əl ilə tamamlama) olduqda
+        istifadə olunan saat notes-a yazılır; avtomatik tamamlama notes-a toxunmur.
+        self boşdursa domain üzrə (məs. vaxtı bitmişlər) işləyir.
+        UPDATE ORM-dən yan keçdiyi üçün yazma hüquqları və record rule-lar əvvəlcədən yoxlanılır.
+        """
+        if self:
+            sessions = self
+        elif domain is not None:
+            sessions = self.search(domain + [('state', 'in', OCCUPYING_STATES)])
+        else:
+            return self.browse()
+        if not sessions:
+            return self.browse()
+        sessions.check_access('write')
+        now = fields.Datetime.now()
+        self.flush_model(['state', 'end_time', 'duration_hours', 'extended_time', 'notes'])
+        if with_notes:
+            notes = SQL(", ").join(
+                SQL("(%s, %s)", s.id, f"Sessiya tamamlandı: {now}. "
+                                      f"İstifadə edilən saat: {s.duration_hours + s.extended_time}")
+                for s in sessions
+            )
+            self.env.cr.execute(SQL("""
+                UPDATE badminton_session AS session
+                   SET state = 'completed',
+                       completion_time = %(now)s,
+                       notes = completion.note,
+                       write_uid = %(uid)s,
+                       write_date = %(now)s
+                  FROM (VALUES %(values)s) AS completion (id, note)
+                 WHERE session.id = completion.id AND session.state IN %(states)s
+             RETURNING session.id
+            """, now=now, uid=self.env.uid, values=notes, states=OCCUPYING_STATES))
+        else:
+            self.env.cr.execute(SQL("""
+                UPDATE badminton_session
+                   SET state = 'completed',
+                       completion_time = %(now)s,
+                       write_uid = %(uid)s,
+                       write_date = %(now)s
+                 WHERE id IN %(ids)s AND state IN %(states)s
+             RETURNING id
+            """, now=now, uid=self.env.uid, ids=tuple(sessions.ids), states=OCCUPYING_STATES))
+        completed = self.browse([row[0] for row in self.env.cr.fetchall()])
+        if not completed:
+            return completed
+
+        fnames = ['state', 'completion_time'] + (['notes'] if with_notes else [])
+        completed.invalidate_recordset(fnames + ['write_uid', 'write_date'])
+        completed.modified(fnames)
+        self.env['badminton.court.occupancy'].sudo()._apply_delta(-len(completed))
+        self.env['volan.cash.metrics.cache']._bump_data_version()
+        self._schedule_session_events_on_commit()
+        completed._notify_reception_on_commit()
+        return completed
+
+    # ---------- hadisə əsaslı planlayıcı ----------
+    _SESSION_WARNING_MINUTES = 5
+
+    @api.model
+    def _cron_session_events(self):
+        """Planlayıcı cron: vaxtı bitənləri tamamla, xəbərdarlıqları göndər, növbəti anı planla"""
+        self._auto_complete_expired_sessions()
+        self.cron_send_session_warnings(self._SESSION_WARNING_MINUTES)
+        self._schedule_next_session_event()
+        return True
+
+    @api.model
+    def _get_next_session_event(self):
+        """Ən yaxın an: xəbərdarlıq göndərilməyibsə end_time - 5 dəq, əks halda end_time"""
+        self.flush_model(['state', 'end_time', 'warn10_sent'])
+        self.env.cr.execute("""
+            SELECT MIN(CASE WHEN warn10_sent THEN end_time ELSE end_time - %s * interval '1 minute' END)
+              FROM badminton_session
+             WHERE state IN %s AND end_time IS NOT NULL
+        """, (self._SESSION_WARNING_MINUTES, OCCUPYING_STATES))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _schedule_next_session_event(self):
+        """Planlayıcı cron üçün növbəti anda bir trigger qur (eyni an üçün təkrar qurulmur)"""
+        next_at = self._get_next_session_event()
+        if not next_at:
+            return False
+        cron = self.env.ref('volan_yasamal.ir_cron_badminton_session_events', raise_if_not_found=False)
+        if not cron:
+            return False
+        now = fields.Datetime.now()
+        next_at = max(next_at, now)
+        # Keçmiş trigger-lər (indi işləyən cron-unku daxil) nəzərə alınmır
+        already_armed = self.env['ir.cron.trigger'].sudo().search_count([
+            ('cron_id', '=', cron.id),
+            ('call_at', '>', now),
+            ('call_at', '<=', next_at),
+        ], limit=1)
+        if not already_armed:
+            cron.sudo()._trigger(at=next_at)
+        return next_at
+
+    def _schedule_session_events_on_commit(self):
+        """Tranzaksiya sonunda bir dəfə yenidən planla (bir neçə write bir trigger verir)"""
+        if self.env.cr.precommit.data.get('badminton_session_events'):
+            return
+        self.env.cr.precommit.data['badminton_session_events'] = True
+        env = self.env
 
+        def reschedule():
+            env.cr.precommit.data.pop('badminton_session_events', None)
+            env['badminton.session']._schedule_next_session_event()
+
+        self.env.cr.precommit.add(reschedule)
 
     @api.model
     def cron_send_session_warnings(self, warning_minutes=5):
@@ -399,30 +709,115 @@ class BadmintonSession(models.Model):
             _logger.info("No sessions found for 10-min warning.")
             return True
 
-        # Находим Odoo Bot и канал 'General'
-        bot_user = self.env.ref('base.user_root')
-        general_channel = self.env.ref('mail.channel_all_employees')
-        
-        if not general_channel:
-            _logger.warning("General channel not found. Cannot send notification.")
-            return False
-
+        # Bütün xəbərdarlıqlar bir icmal mesajında və bir bus hadisəsində
+        warnings = []
         for s in sessions:
-            mins_left = max(1, int((s.end_time - now).total_seconds() // 60))
-            note = f"{s.partner_id.name} üçün sessiyanın bitməsinə {mins_left} dəqiqə qaldı."
+            warnings.append({
+                'session_id': s.id,
+                'name': s.name,
+                'partner_name': s.partner_id.name,
+                'end_time': fields.Datetime.to_string(s.end_time),
+                'minutes_left': max(1, int((s.end_time - now).total_seconds() // 60)),
+            })
 
-            # Отправляем сообщение в чат канала 'General' от имени Odoo Bot
+        # Находим Odoo Bot и канал 'General'
+        bot_user = self.env.ref('base.user_root')
+        general_channel = self.env.ref('mail.channel_all_employees', raise_if_not_found=False)
+        if general_channel:
+            lines = [f"{w['partner_name']} üçün sessiyanın bitməsinə {w['minutes_left']} dəqiqə qaldı."
+                     for w in warnings]
+            # partner_ids göndərilmir: kanal üzvləri mesajı onsuz da görür, hər işçiyə bildiriş yaranmır
             general_channel.with_user(bot_user).message_post(
-                body=note,
+                body=Markup('<br/>').join(lines),
                 message_type='notification',
                 subtype_xmlid='mail.mt_comment',
-                partner_ids=general_channel.channel_partner_ids.ids,
             )
+        else:
+            _logger.warning("General channel not found. Cannot send notification.")
 
-            s.warn10_sent = True
-            _logger.info("Sent Odoo Bot warning for session %s. %s mins left.", s.id, mins_left)
-
+        for group in self._get_reception_bus_groups():
+            self.env['bus.bus']._sendone(group, 'volan_badminton_session/warning', {
+                'warnings': warnings,
+            })
+        sessions.write({'warn10_sent': True})
+        _logger.info("Sent session end warning digest for %s sessions.", len(sessions))
         return True
+
+    @api.model
+    def _get_reception_bus_groups(self):
+        """Resepsiya qruplarının bus hədəfləri.
+
+        Başqa hədəf qrupu implied edən qrup çıxarılır (admin nəzarətçini ehtiva edir),
+        ona görə hər istifadəçi hadisəni bir dəfə alır.
+        """
+        groups = self.env['res.groups'].sudo()
+        for xmlid in RECEPTION_GROUP_XMLIDS:
+            groups |= self.env.ref(xmlid, raise_if_not_found=False) or groups.browse()
+        return groups.filtered(lambda group: not (group.trans_implied_ids & groups))
+
+    # ---------- resepsiya ekranı (bus delta) ----------
+    _RECEPTION_STATES = ('draft',) + OCCUPYING_STATES
+    _RECEPTION_FIELDS = {'state', 'partner_id', 'start_time', 'end_time', 'duration_hours', 'promo_type'}
+
+    def _reception_values(self):
+        """Ekran üçün yığcam sətirlər; qalan vaxtı klient end_time-dan özü hesablayır"""
+        return [{
+            'id': session['id'],
+            'name': session['name'],
+            'partner_name': session['partner_id'][1] if session['partner_id'] else '',
+            'state': session['state'],
+            'promo_type': session['promo_type'] or False,
+            'created_at': fields.Datetime.to_string(session['created_at']),
+            'start_time': fields.Datetime.to_string(session['start_time']),
+            'end_time': fields.Datetime.to_string(session['end_time']),
+        } for session in self.read(['name', 'partner_id', 'state', 'promo_type',
+                                    'created_at', 'start_time', 'end_time'])]
+
+    @api.model
+    def get_reception_snapshot(self):
+        """Resepsiya ekranının ilk yüklənməsi: gözləmədə və aktiv sessiyalar + zal doluluğu.
+
+        Sonrakı dəyişikliklər resepsiya qruplarının kanalında 'volan_badminton_session/delta'
+        hadisələri ilə gəlir, ona görə ekran sorğu ilə yenilənmir.
+        """
+        sessions = self.search([('state', 'in', self._RECEPTION_STATES)], order='created_at, id')
+        return {
+            'sessions': sessions._reception_values(),
+            'occupancy': self.env['badminton.court.occupancy'].sudo().get_occupancy(),
+            'server_time': fields.Datetime.to_string(fields.Datetime.now()),
+        }
+
+    def _notify_reception_on_commit(self):
+        """Dəyişən sessiyaları topla; tranzaksiya sonunda bir delta hadisəsi göndərilir"""
+        if not self.ids:
+            return
+        data = self.env.cr.precommit.data
+        if 'badminton_reception_ids' not in data:
+            data['badminton_reception_ids'] = set()
+            env = self.env
+
+            def send_delta():
+                session_ids = data.pop('badminton_reception_ids', set())
+                env['badminton.session']._send_reception_delta(session_ids)
+
+            self.env.cr.precommit.add(send_delta)
+        data['badminton_reception_ids'].update(self.ids)
+
+    @api.model
+    def _send_reception_delta(self, session_ids):
+        """Başlama / uzatma / tamamlama / ləğv: yalnız dəyişən sətirlər göndərilir"""
+        if not session_ids:
+            return
+        sessions = self.browse(session_ids).exists()
+        visible = sessions.filtered(lambda s: s.state in self._RECEPTION_STATES)
+        payload = {
+            'upsert': visible._reception_values(),
+            'remove': sorted(set(session_ids) - set(visible.ids)),
+            'occupancy': self.env['badminton.court.occupancy'].sudo().get_occupancy(),
+        }
+        for group in self._get_reception_bus_groups():
+            self.env['bus.bus']._sendone(group, 'volan_badminton_session/delta', payload)
+
     # --------- simple queries ----------
     @api.model
     def get_active_sessions(self):
@@ -459,8 +854,7 @@ class BadmintonSession(models.Model):
     @api.model
     def _auto_complete_expired_sessions(self):
         """Автодоворот просроченных в completed (если нужно)."""
-        now = fields.Datetime.now()
-        expired = self.search([('state', 'in', ['active', 'extended']), ('end_time', '<', now)])
-        for s in expired:
-            s.write({'state': 'completed', 'completion_time': now})
+        self.browse()._complete_sessions_bulk([('end_time', '<', fields.Datetime.now())])
+        # Sayğacın sürüşməsini (məs. SQL ilə dəyişiklik) düzəlt
+        self.env['badminton.court.occupancy'].sudo().recount()
         return True
\ No newline at end of file
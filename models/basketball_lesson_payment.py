@@ -32,6 +32,9 @@ class BasketballLessonPayment(models.Model):
     # Qeydlər
     notes = fields.Text(string="Qeydlər")
     
+    # Ümumi Qalığa (kassa checkpoint-lərinə) təsir edən sahələr
+    _CASH_BALANCE_FIELDS = {'amount', 'payment_date', 'real_date', 'payment_method_lesson'}
+
     # Çap sayı (tracking üçün)
     print_count = fields.Integer(string="Çap Sayı", default=0, readonly=True)
     last_print_date = fields.Datetime(string="Son Çap Tarixi", readonly=True)
@@ -89,6 +92,7 @@ class BasketballLessonPayment(models.Model):
             })
             payment.cash_flow_id = cash_flow.id
         
+        payment._invalidate_cash_checkpoints()
         return payment
     
     def write(self, vals):
@@ -98,7 +102,14 @@ class BasketballLessonPayment(models.Model):
         if 'real_date' in vals and not self.env.user.has_group('base.group_system'):
             vals.pop('real_date')
 
+        affects_balance = bool(self._CASH_BALANCE_FIELDS.intersection(vals))
+        if affects_balance:
+            self._invalidate_cash_checkpoints()
+
         res = super(BasketballLessonPayment, self).write(vals)
+
+        if affects_balance:
+            self._invalidate_cash_checkpoints()
         
         # Əgər məbləğ və ya kassaya düşmə tarixi dəyişibsə, kassanı yenilə
         if 'amount' in vals or 'real_date' in vals:
@@ -119,24 +130,18 @@ class BasketballLessonPayment(models.Model):
     
     def unlink(self):
         """Ödəniş silinərkən kassadan da sil"""
-        for payment in self:
-            # Kassa əməliyyatını tap və sil
-            cash_flows = self.env['volan.cash.flow'].search([
-                ('related_model', '=', 'basketball.lesson.payment'),
-                ('related_id', '=', payment.id)
-            ])
-            if cash_flows:
-                # related_model-i sıfırla ki, unlink qadağası işləməsin
-                cash_flows.write({'related_model': False, 'related_id': False})
-                cash_flows.unlink()
-            
-            # Əski sistemlə uyğunluq üçün
-            if payment.cash_flow_id:
-                payment.cash_flow_id.write({'related_model': False, 'related_id': False})
-                payment.cash_flow_id.unlink()
-        
+        self._invalidate_cash_checkpoints()
+        # Kassa əməliyyatlarını bir sorğu ilə tap və sil (əski sistemlə uyğunluq üçün cash_flow_id də)
+        self.env['volan.cash.flow']._unlink_for_sources(
+            'basketball.lesson.payment', self.ids, extra_flows=self.mapped('cash_flow_id'))
+
         return super(BasketballLessonPayment, self).unlink()
     
+    def _invalidate_cash_checkpoints(self):
+        """Bağlanmış aya düşən ödənişlər üçün aylıq kassa checkpoint-lərini sıfırla"""
+        self.env['volan.cash.checkpoint']._invalidate(
+            'basketball', self.mapped('payment_date') + self.mapped('real_date'))
+
     def name_get(self):
         """Display name"""
         result = []
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from odoo.tools import float_compare
+from odoo.tools import float_compare, create_index
 from datetime import timedelta
 from dateutil.relativedelta import relativedelta
 from calendar import monthrange
@@ -82,6 +82,11 @@ class BasketballLessonSimple(models.Model):
         ('overdue', 'Vaxtından keçmiş'),
     ], string="Abunəlik Ödəniş Statusu", compute='_compute_subscription_payment_status', store=True)
     
+    def init(self):
+        # Kassa "yeni uşaq" sayı üçün: müştəri üzrə ilk abunəlik tarixini indeksdən tap
+        create_index(self.env.cr, f'{self._table}_partner_payment_date_idx',
+                     self._table, ['partner_id', 'payment_date'])
+
     @api.depends('payment_date', 'payment_ids.payment_date')
     def _compute_end_date(self):
         for lesson in self:
@@ -352,6 +357,8 @@ class BasketballLessonSimple(models.Model):
         if lesson.state == 'active' and not lesson.payment_ids:
             lesson._create_initial_payment()
         
+        # Uşaq/müştəri sayları kassa dashboard-larında göstərilir
+        self.env['volan.cash.metrics.cache']._bump_data_version()
         return lesson
     
     def write(self, vals):
@@ -373,6 +380,9 @@ class BasketballLessonSimple(models.Model):
 
         result = super(BasketballLessonSimple, self).write(vals)
 
+        if {'state', 'payment_date', 'partner_id'}.intersection(vals):
+            self.env['volan.cash.metrics.cache']._bump_data_version()
+
         if lesson_fee_updated:
             zero_fee_records = self.filtered(lambda l: self._is_zero_fee(l.lesson_fee))
             zero_fee_records._set_state_with_history('free')
@@ -589,6 +599,7 @@ class BasketballLessonSimple(models.Model):
                     f'💡 Əvvəlcə bütün ödəniş sətirlərini silməlisiniz!'
                 )
         
+        self.env['volan.cash.metrics.cache']._bump_data_version()
         return super(BasketballLessonSimple, self).unlink()
 
 class BasketballLessonScheduleSimple(models.Model):
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+from odoo import models, api
+from odoo.exceptions import AccessError, UserError
+import json
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+BENCH_PREFIX = 'BENCH-'
+
+
+class VolanBenchmark(models.AbstractModel):
+    """Sintetik yük məlumatı generatoru və dashboard/cron benchmark-ları.
+
+    İstifadə (odoo shell, test bazasında):
+        env['volan.benchmark'].generate_data('100k', seed=42)
+        env['volan.benchmark'].run_benchmarks(store_baseline=True)   # ilk dəfə
+        env['volan.benchmark'].run_benchmarks()                      # sonra: reqressiya hesabatı
+        env['volan.benchmark'].clear_data()
+
+    Generator eyni seed ilə həmişə eyni məlumatı yaradır (PostgreSQL setseed). Benchmark-lar
+    savepoint daxilində işləyir və geri qaytarılır, ona görə bazaya iz qoymur.
+    """
+    _name = 'volan.benchmark'
+    _description = 'Volan Benchmark'
+
+    # baza ölçüsü -> sessiya/kassa axını sayı; qalan cədvəllər ona nisbətən
+    _SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+    _BASELINE_PARAM = 'volan_yasamal.benchmark_baseline'
+    _DEFAULT_TOLERANCE = 0.25
+    _PARTNER_BATCH = 1000
+    # setseed(seed / _MAX_SEED): hər tam seed öz dəyərinə düşür (1:1)
+    _MAX_SEED = 1_000_000
+
+    def _check_admin(self):
+        if not self.env.is_admin():
+            raise AccessError("Benchmark yalnız administrator üçündür!")
+
+    # ---------- generator ----------
+    @api.model
+    def generate_data(self, size='10k', seed=42):
+        """Müştəri, abunəlik, ödəniş, satış, sessiya və kassa axınları yarat"""
+        self._check_admin()
+        if size not in self._SIZES:
+            raise UserError(f"Naməlum ölçü: {size} (mümkün: {', '.join(self._SIZES)})")
+        if not isinstance(seed, int) or not 0 <= seed <= self._MAX_SEED:
+            raise UserError(f"Seed 0 ilə {self._MAX_SEED} arasında tam ədəd olmalıdır: {seed}")
+        rows = self._SIZES[size]
+        counts = {
+            'partners': max(rows // 20, 10),
+            'lessons': max(rows // 20, 10),
+            'payments': rows // 4,
+            'sales': rows // 4,
+            'sessions': rows,
+            'cash_flows': rows // 10,
+        }
+        started = time.perf_counter()
+        # eyni seed -> eyni məlumat: əvvəlki benchmark məlumatını təmizlə
+        self.clear_data()
+        partner_ids = self._generate_partners(counts['partners'])
+        cr = self.env.cr
+        # setseed [-1, 1] aralığında olmalıdır
+        cr.execute("SELECT setseed(%s)", (seed / self._MAX_SEED,))
+        self._generate_lessons(partner_ids, counts['lessons'])
+        self._generate_payments(counts['payments'])
+        self._generate_sales(partner_ids, counts['sales'])
+        self._generate_sessions(partner_ids, counts['sessions'])
+        self._generate_cash_flows(counts['cash_flows'])
+
+        self.env.invalidate_all()
+        self.env['badminton.court.occupancy'].recount()
+        self.env['volan.cash.daily.summary'].rebuild()
+        self.env['volan.cash.checkpoint'].rebuild()
+        self.env['volan.cash.metrics.cache']._bump_data_version()
+        _logger.info("Benchmark məlumatı yaradıldı (%s, seed=%s) %.1fs: %s",
+                     size, seed, time.perf_counter() - started, counts)
+        return counts
+
+    def _generate_partners(self, count):
+        partner_obj = self.env['res.partner'].with_context(tracking_disable=True)
+        partner_ids = []
+        for start in range(0, count, self._PARTNER_BATCH):
+            batch = [{'name': f'{BENCH_PREFIX}{index:07d}', 'ref': BENCH_PREFIX.rstrip('-'),
+                      'badminton_balance': 10}
+                     for index in range(start, min(start + self._PARTNER_BATCH, count))]
+            partner_ids += partner_obj.create(batch).ids
+            self.env.invalidate_all()
+        return partner_ids
+
+    def _generate_lessons(self, partner_ids, count):
+        for table, prefix in (('badminton_lesson_simple', 'BL'), ('basketball_lesson_simple', 'KL')):
+            self.env.cr.execute(f"""
+                INSERT INTO {table} (name, partner_id, start_date, payment_date, lesson_fee, state,
+                                     create_uid, create_date, write_uid, write_date)
+                SELECT %(prefix)s || n,
+                       (%(partner_ids)s::int[])[1 + floor(random() * %(partners)s)::int],
+                       d, d, 80 + floor(random() * 5) * 10,
+                       (ARRAY['active', 'active', 'active', 'cancelled', 'free'])[1 + floor(random() * 5)::int],
+                       %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+                  FROM (SELECT n, (current_date - floor(random() * 730)::int) AS d
+                          FROM generate_series(1, %(count)s) n) s
+            """, {'prefix': f'{BENCH_PREFIX}{prefix}', 'partner_ids': partner_ids,
+                  'partners': len(partner_ids), 'count': count, 'uid': self.env.uid})
+
+    def _generate_payments(self, count):
+        for table, lesson_table in (('badminton_lesson_payment', 'badminton_lesson_simple'),
+                                    ('basketball_lesson_payment', 'basketball_lesson_simple')):
+            self.env.cr.execute(f"""
+                INSERT INTO {table} (lesson_id, partner_id, payment_method_lesson, payment_date, real_date,
+                                     amount, notes, create_uid, create_date, write_uid, write_date)
+                SELECT l.id, l.partner_id,
+                       CASE WHEN random() < 0.7 THEN 'cash' ELSE 'card' END,
+                       s.d, s.d + (CASE WHEN random() < 0.2 THEN floor(random() * 45)::int ELSE 0 END),
+                       l.lesson_fee, %(note)s,
+                       %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+                  FROM (SELECT n, (current_date - floor(random() * 730)::int) AS d,
+                               floor(random() * (SELECT count(*) FROM {lesson_table} WHERE name LIKE %(like)s))::int AS k
+                          FROM generate_series(1, %(count)s) n) s
+                  JOIN (SELECT id, partner_id, lesson_fee, row_number() OVER (ORDER BY id) - 1 AS k
+                          FROM {lesson_table} WHERE name LIKE %(like)s) l ON l.k = s.k
+            """, {'count': count, 'like': f'{BENCH_PREFIX}%', 'note': BENCH_PREFIX, 'uid': self.env.uid})
+
+    def _generate_sales(self, partner_ids, count):
+        self.env.cr.execute("""
+            INSERT INTO badminton_sale (name, partner_id, customer_type, package_type, hours_quantity,
+                                        unit_price, total_amount, amount_paid, payment_date, payment_method,
+                                        state, create_uid, create_date, write_uid, write_date)
+            SELECT %(prefix)s || n,
+                   (%(partner_ids)s::int[])[1 + floor(random() * %(partners)s)::int],
+                   CASE WHEN random() < 0.3 THEN 'child' ELSE 'adult' END, 'single',
+                   h, 8, h * 8, h * 8,
+                   (now() at time zone 'UTC') - make_interval(mins => floor(random() * 730 * 24 * 60)::int),
+                   (ARRAY['cash', 'card', 'abonent'])[1 + floor(random() * 3)::int],
+                   'paid', %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (SELECT n, 1 + floor(random() * 4)::int AS h FROM generate_series(1, %(count)s) n) s
+        """, {'prefix': f'{BENCH_PREFIX}S', 'partner_ids': partner_ids, 'partners': len(partner_ids),
+              'count': count, 'uid': self.env.uid})
+
+    def _generate_sessions(self, partner_ids, count):
+        """Tamamlanmış tarixçə + canlı zal: aktiv/uzadılmış sessiyalar və növbə.
+
+        Canlı sessiyaların bitmə vaxtı indidən -10..+15 dəqiqə aralığındadır, ona görə
+        bitmə, xəbərdarlıq, növbə və qəbul benchmark-ları boş çoxluq üzərində işləmir.
+        Hər canlı sessiyanın öz müştərisi var (siyahının sonundan - ilk müştəri
+        start_session_manual/QR benchmark-ları üçün boş qalır).
+        """
+        capacity = self.env['badminton.court.occupancy']._get_max_capacity()
+        free_partners = max(len(partner_ids) - 1, 0)
+        active_count = min(capacity // 2, free_partners)
+        queue_count = min(max(count // 1000, capacity * 2), free_partners - active_count)
+        live_partner_ids = partner_ids[len(partner_ids) - active_count - queue_count:]
+        self._generate_live_sessions(live_partner_ids[:active_count], live_partner_ids[active_count:])
+        count -= active_count + queue_count
+
+        self.env.cr.execute("""
+            INSERT INTO badminton_session (name, partner_id, start_time, end_time, duration_hours, state,
+                                           payment_type, promo_type, created_at, completion_time, warn10_sent,
+                                           create_uid, create_date, write_uid, write_date)
+            SELECT %(prefix)s || n,
+                   (%(partner_ids)s::int[])[1 + floor(random() * %(partners)s)::int],
+                   st, st + interval '1 hour', 1.0, 'completed',
+                   (ARRAY['cash', 'card', 'abonent'])[1 + floor(random() * 3)::int],
+                   CASE WHEN random() < 0.15
+                        THEN (ARRAY['1fit', 'push30', 'push30_plus', 'tripsome'])[1 + floor(random() * 4)::int] END,
+                   st, st + interval '1 hour', true,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (SELECT n, (now() at time zone 'UTC') - interval '1 hour'
+                              - make_interval(mins => floor(random() * 730 * 24 * 60)::int) AS st
+                      FROM generate_series(1, %(count)s) n) s
+        """, {'prefix': f'{BENCH_PREFIX}G', 'partner_ids': partner_ids, 'partners': len(partner_ids),
+              'count': count, 'uid': self.env.uid})
+
+    def _generate_live_sessions(self, active_partner_ids, queue_partner_ids):
+        cr = self.env.cr
+        params = {'prefix': f'{BENCH_PREFIX}G', 'uid': self.env.uid}
+        cr.execute("""
+            INSERT INTO badminton_session (name, partner_id, start_time, end_time, duration_hours, state,
+                                           payment_type, created_at, warn10_sent,
+                                           create_uid, create_date, write_uid, write_date)
+            SELECT %(prefix)s || 'A' || n, p.partner_id, et - make_interval(hours => h), et, h,
+                   CASE WHEN h > 1 THEN 'extended' ELSE 'active' END,
+                   (ARRAY['cash', 'card', 'abonent'])[1 + floor(random() * 3)::int],
+                   et - make_interval(hours => h), false,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (SELECT n, partner_id,
+                           CASE WHEN random() < 0.3 THEN 2 ELSE 1 END AS h,
+                           (now() at time zone 'UTC') + make_interval(secs => -600 + floor(random() * 1500)::int) AS et
+                      FROM unnest(%(partner_ids)s::int[]) WITH ORDINALITY AS p(partner_id, n)) p
+        """, dict(params, partner_ids=active_partner_ids))
+        cr.execute("""
+            INSERT INTO badminton_session (name, partner_id, duration_hours, state, payment_type,
+                                           created_at, warn10_sent,
+                                           create_uid, create_date, write_uid, write_date)
+            SELECT %(prefix)s || 'Q' || n, partner_id, 1.0, 'draft', 'abonent',
+                   (now() at time zone 'UTC') - make_interval(mins => floor(random() * 60)::int), false,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM unnest(%(partner_ids)s::int[]) WITH ORDINALITY AS p(partner_id, n)
+        """, dict(params, partner_ids=queue_partner_ids))
+
+    def _generate_cash_flows(self, other_count):
+        """Ödəniş/satışlara uyğun kassa axınları + 'digər' mədaxil/məxaric"""
+        cr = self.env.cr
+        params = {'like': f'{BENCH_PREFIX}%', 'note': BENCH_PREFIX, 'uid': self.env.uid, 'count': other_count}
+        for table, model, category, sport in (
+                ('badminton_lesson_payment', 'badminton.lesson.payment', 'badminton_lesson', 'badminton'),
+                ('basketball_lesson_payment', 'basketball.lesson.payment', 'basketball_lesson', 'basketball')):
+            cr.execute(f"""
+                INSERT INTO volan_cash_flow (name, date, amount, transaction_type, category, sport_type, partner_id,
+                                             related_model, related_id, create_uid, create_date, write_uid, write_date)
+                SELECT %(note)s || p.id, p.real_date, p.amount, 'income', %(category)s, %(sport)s, p.partner_id,
+                       %(model)s, p.id, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+                  FROM {table} p WHERE p.notes = %(note)s
+            """, dict(params, model=model, category=category, sport=sport))
+        cr.execute("""
+            INSERT INTO volan_cash_flow (name, date, amount, transaction_type, category, sport_type, partner_id,
+                                         related_model, related_id, create_uid, create_date, write_uid, write_date)
+            SELECT %(note)s || s.id, (s.payment_date)::date, s.amount_paid, 'income', 'badminton_sale', 'badminton',
+                   s.partner_id, 'badminton.sale', s.id,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM badminton_sale s WHERE s.name LIKE %(like)s
+        """, params)
+        cr.execute("""
+            INSERT INTO volan_cash_flow (name, date, amount, transaction_type, category, sport_type,
+                                         create_uid, create_date, write_uid, write_date)
+            SELECT %(note)s || 'O' || n, current_date - floor(random() * 730)::int,
+                   10 + floor(random() * 500),
+                   CASE WHEN random() < 0.4 THEN 'income' ELSE 'expense' END, 'other',
+                   CASE WHEN random() < 0.5 THEN 'badminton' ELSE 'basketball' END,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM generate_series(1, %(count)s) n
+        """, params)
+
+    @api.model
+    def clear_data(self):
+        """Generatorun yaratdığı bütün məlumatı sil"""
+        self._check_admin()
+        cr = self.env.cr
+        like = f'{BENCH_PREFIX}%'
+        cr.execute("DELETE FROM volan_cash_flow WHERE name LIKE %s", (like,))
+        cr.execute("DELETE FROM badminton_session WHERE name LIKE %s", (like,))
+        cr.execute("DELETE FROM badminton_sale WHERE name LIKE %s", (like,))
+        for table in ('badminton_lesson_payment', 'basketball_lesson_payment'):
+            cr.execute(f"DELETE FROM {table} WHERE notes = %s", (BENCH_PREFIX,))
+        for table in ('badminton_lesson_simple', 'basketball_lesson_simple'):
+            cr.execute(f"DELETE FROM {table} WHERE name LIKE %s", (like,))
+        self.env.invalidate_all()
+        partners = self.env['res.partner'].with_context(active_test=False).search([('ref', '=', BENCH_PREFIX.rstrip('-'))])
+        partners.unlink()
+        self.env['badminton.court.occupancy'].recount()
+        self.env['volan.cash.daily.summary'].rebuild()
+        self.env['volan.cash.checkpoint'].rebuild()
+        self.env['volan.cash.metrics.cache']._bump_data_version()
+        return True
+
+    # ---------- benchmark-lar ----------
+    def _measure(self, func):
+        """func()-u savepoint daxilində icra et, vaxt və SQL sorğu sayını ölç, sonra geri qaytar.
+
+        Savepoint-in geri qaytarılması precommit/postcommit callback-lərini silmir: func-un
+        növbəyə qoyduğu bildiriş və cron tetikləmələri commit-də işləməsin deyə onlar da
+        təmizlənir (əvvəlki precommit-lər ölçmədən qabaq icra olunur).
+        """
+        cr = self.env.cr
+        self.env.flush_all()
+        cr.precommit.run()
+        self.env.invalidate_all()
+        with cr.savepoint(flush=False) as savepoint:
+            queries_before = cr.sql_log_count
+            started = time.perf_counter()
+            func()
+            self.env.flush_all()
+            elapsed = time.perf_counter() - started
+            queries = cr.sql_log_count - queries_before
+            savepoint.rollback()
+        cr.precommit.clear()
+        cr.postcommit.clear()
+        self.env.invalidate_all()
+        return {'time': round(elapsed, 4), 'queries': queries}
+
+    def _benchmark_cases(self):
+        """{ad: funksiya} - hər biri müstəqil ölçülür"""
+        session_obj = self.env['badminton.session']
+        partner = self.env['res.partner'].search([('ref', '=', BENCH_PREFIX.rstrip('-'))], limit=1)
+
+        def gather(model_name, date_filter):
+            return lambda: self.env[model_name]._gather_metrics(override={'date_filter': date_filter}, force=True)
+
+        def start_manual():
+            partner.badminton_balance = 5
+            session_obj.create({'partner_id': partner.id, 'duration_hours': 1.0}).start_session_manual()
+
+        def scan_qr():
+            partner.badminton_balance = 5
+            session_obj.search([('partner_id', '=', partner.id), ('state', 'in', ['active', 'extended'])]).write(
+                {'state': 'completed'})
+            self.env['qr.scanner.wizard'].create({
+                'qr_code_input': f'ID-{partner.id}-NAME-{partner.name}',
+                'service_type': 'badminton',
+            }).scan_and_start_session()
+
+        cases = {
+            'badminton.cash.balance._gather_metrics(month)': gather('badminton.cash.balance', 'month'),
+            'badminton.cash.balance._gather_metrics(year)': gather('badminton.cash.balance', 'year'),
+            'basketball.cash.balance._gather_metrics(month)': gather('basketball.cash.balance', 'month'),
+            'basketball.cash.balance._gather_metrics(year)': gather('basketball.cash.balance', 'year'),
+            'badminton.session._auto_complete_expired_sessions': session_obj._auto_complete_expired_sessions,
+            'badminton.session.cron_send_session_warnings': session_obj.cron_send_session_warnings,
+            'badminton.session.start_next_from_queue': session_obj.start_next_from_queue,
+        }
+        if partner:
+            cases['badminton.session.start_session_manual'] = start_manual
+            cases['qr.scanner.wizard.scan_and_start_session'] = scan_qr
+        return cases
+
+    @api.model
+    def run_benchmarks(self, store_baseline=False, tolerance=None, repeat=3):
+        """Bütün benchmark-ları işlət (ən yaxşı nəticə götürülür) və baseline ilə müqayisə et.
+
+        Reqressiya: vaxt baseline-dan (1 + tolerance) dəfə çox və ya sorğu sayı baseline-dan çox.
+        """
+        self._check_admin()
+        tolerance = self._DEFAULT_TOLERANCE if tolerance is None else tolerance
+        params = self.env['ir.config_parameter'].sudo()
+        baseline = json.loads(params.get_param(self._BASELINE_PARAM) or '{}')
+
+        report = {}
+        for name, func in self._benchmark_cases().items():
+            runs = [self._measure(func) for _i in range(max(repeat, 1))]
+            result = min(runs, key=lambda run: run['time'])
+            base = baseline.get(name)
+            if base:
+                result['baseline_time'] = base['time']
+                result['baseline_queries'] = base['queries']
+                result['regression'] = (result['time'] > base['time'] * (1 + tolerance)
+                                        or result['queries'] > base['queries'])
+            else:
+                result['regression'] = False
+            report[name] = result
+            _logger.info("Benchmark %s: %.4fs, %s sorğu%s", name, result['time'], result['queries'],
+                         ' - REQRESSİYA' if result['regression'] else '')
+
+        if store_baseline:
+            params.set_param(self._BASELINE_PARAM, json.dumps(
+                {name: {'time': result['time'], 'queries': result['queries']} for name, result in report.items()}))
+        return report
@@ -1,59 +1,195 @@
 from odoo import models, fields, api
 from odoo.osv.expression import OR
 from odoo.exceptions import ValidationError
+from odoo.tools import create_index, index_exists, date_utils
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+TRANSACTION_TYPE_SELECTION = [
+    ('income', 'Mədaxil'),
+    ('expense', 'Məxaric'),
+]
+
+CATEGORY_SELECTION = [
+    ('badminton_sale', 'Badminton Satışı'),
+    ('badminton_lesson', 'Badminton Dərs'),
+    ('basketball_lesson', 'Basketbol Dərs'),
+    ('other', 'Digər'),
+]
+
+SPORT_TYPE_SELECTION = [
+    ('badminton', 'Badminton'),
+    ('basketball', 'Basketbol'),
+    ('general', 'Ümumi')
+]
+
+
+SUBSCRIPTION_BUCKETS = ('timely', 'delayed', 'all_for_report')
+
+
+def _query_subscription_payment_buckets(env, model_name, date_from, date_to, delayed_start, delayed_end, with_ids=False):
+    """Abunəlik ödənişlərini tək SQL sorğusu ilə təsnif edir.
+
+    - timely: payment_date [date_from, date_to] aralığında
+    - delayed: real_date [date_from, date_to] aralığında, payment_date isə [delayed_start, delayed_end]-dən kənarda
+    - all_for_report: timely ∪ delayed
+
+    Hər dəst üçün {'cash', 'card', 'total'} məbləğləri və with_ids=True olduqda
+    {'ids': {ödəniş metodu: [id, ...]}} qaytarılır; qeydlər (recordset) yaradılmır.
+    """
+    payment_obj = env[model_name]
+    buckets = {
+        name: {'cash': 0.0, 'card': 0.0, 'total': 0.0, 'ids': {'cash': [], 'card': []}}
+        for name in SUBSCRIPTION_BUCKETS
+    }
+    if not date_from or not date_to:
+        return buckets
+
+    payment_obj.check_access_rights('read')
+    payment_obj.flush_model(['payment_date', 'real_date', 'amount', 'payment_method_lesson'])
+    id_columns = ''
+    if with_ids:
+        id_columns = """,
+               array_agg(id) FILTER (WHERE is_timely),
+               array_agg(id) FILTER (WHERE is_delayed),
+               array_agg(id) FILTER (WHERE is_timely OR is_delayed)"""
+    env.cr.execute(f"""
+        WITH classified AS (
+            SELECT id, payment_method_lesson, COALESCE(amount, 0.0) AS amount,
+                   (payment_date BETWEEN %(date_from)s AND %(date_to)s) IS TRUE AS is_timely,
+                   (real_date BETWEEN %(date_from)s AND %(date_to)s
+                    AND (payment_date IS NULL
+                         OR payment_date < %(delayed_start)s
+                         OR payment_date > %(delayed_end)s)) IS TRUE AS is_delayed
+              FROM {payment_obj._table}
+             WHERE payment_date BETWEEN %(date_from)s AND %(date_to)s
+                OR real_date BETWEEN %(date_from)s AND %(date_to)s
+        )
+        SELECT payment_method_lesson,
+               COALESCE(SUM(amount) FILTER (WHERE is_timely), 0.0),
+               COALESCE(SUM(amount) FILTER (WHERE is_delayed), 0.0),
+               COALESCE(SUM(amount) FILTER (WHERE is_timely OR is_delayed), 0.0){id_columns}
+          FROM classified
+      GROUP BY payment_method_lesson
+    """, {
+        'date_from': date_from,
+        'date_to': date_to,
+        'delayed_start': delayed_start,
+        'delayed_end': delayed_end,
+    })
+    for row in env.cr.fetchall():
+        method = row[0]
+        for index, name in enumerate(SUBSCRIPTION_BUCKETS):
+            bucket = buckets[name]
+            amount = row[1 + index]
+            bucket['total'] += amount
+            if method in ('cash', 'card'):
+                bucket[method] += amount
+            if with_ids:
+                bucket['ids'].setdefault(method, []).extend(row[4 + index] or [])
+    return buckets
+
+
+def _bucket_ids(bucket, method=None):
+    """Dəstdən id siyahısı: method verilibsə yalnız həmin ödəniş metodu üzrə"""
+    if method:
+        return bucket['ids'].get(method, [])
+    return [payment_id for ids in bucket['ids'].values() for payment_id in ids]
+
+
+
+def _query_child_counts(env, model_name, date_from, date_to):
+    """Abunəlik cədvəlindən tək sorğu ilə (aktiv müştəri sayı, yeni müştəri sayı).
+
+    Yeni müştəri: ilk abunəliyinin payment_date-i [date_from, date_to] aralığına düşən müştəri.
+    Ləğv edilmiş/bərpa olunmuş abunəliklər də tarixçəyə daxildir (əvvəlki search kimi).
+    """
+    lesson_obj = env[model_name]
+    lesson_obj.check_access_rights('read')
+    lesson_obj.flush_model(['partner_id', 'payment_date', 'state'])
+    env.cr.execute(f"""
+        SELECT (SELECT COUNT(DISTINCT partner_id) FROM {lesson_obj._table} WHERE state = 'active'),
+               (SELECT COUNT(*)
+                  FROM (SELECT partner_id
+                          FROM {lesson_obj._table}
+                         WHERE payment_date IS NOT NULL
+                      GROUP BY partner_id
+                        HAVING MIN(payment_date) BETWEEN %(date_from)s AND %(date_to)s) first_lessons)
+    """, {'date_from': date_from or None, 'date_to': date_to or None})
+    total_children, new_children = env.cr.fetchone()
+    if not date_from or not date_to:
+        new_children = 0
+    return total_children, new_children
+
 
 class CashFlow(models.Model):
     _name = 'volan.cash.flow'
     _description = 'Kassa Axını'
     _order = 'date desc, id desc'
+
+    # Dashboard filtrləri (idman + tarix intervalı + kateqoriya/növ) və mənbə sənəd axtarışı üçün
+    _CASH_FLOW_INDEXES = {
+        'volan_cash_flow_sport_date_idx': (['sport_type', 'date', 'category', 'transaction_type'], ''),
+        'volan_cash_flow_source_idx': (['related_model', 'related_id'], 'related_model IS NOT NULL'),
+    }
     
     name = fields.Char('Ad', required=True)
-    date = fields.Date('Tarix', required=True, default=fields.Date.today)
+    date = fields.Date('Tarix', required=True, default=fields.Date.today, index=True)
     amount = fields.Float('Məbləğ', required=True)
-    transaction_type = fields.Selection([
-        ('income', 'Mədaxil'),
-        ('expense', 'Məxaric'),
-    ], string='Əməliyyat Növü', required=True)
-    category = fields.Selection([
-        ('badminton_sale', 'Badminton Satışı'),
-        ('badminton_lesson', 'Badminton Dərs'),
-        ('basketball_lesson', 'Basketbol Dərs'),
-        ('other', 'Digər'),
-    ], string='Kateqoriya', required=True, default='other')
+    transaction_type = fields.Selection(TRANSACTION_TYPE_SELECTION, string='Əməliyyat Növü', required=True)
+    category = fields.Selection(CATEGORY_SELECTION, string='Kateqoriya', required=True, default='other')
     
     # Sport növü əlavə edək
-    sport_type = fields.Selection([
-        ('badminton', 'Badminton'),
-        ('basketball', 'Basketbol'),
-        ('general', 'Ümumi')
-    ], string='İdman Növü', required=True, default='general', help='Bu əməliyyatın hansı idman növünə aid olduğunu göstərir')
+    sport_type = fields.Selection(SPORT_TYPE_SELECTION, string='İdman Növü', required=True, default='general',
+                                  help='Bu əməliyyatın hansı idman növünə aid olduğunu göstərir')
     notes = fields.Text('Qeydlər')
     partner_id = fields.Many2one('res.partner', string='Müştəri')
     related_model = fields.Char('Əlaqəli Model', readonly=True)
     related_id = fields.Integer('Əlaqəli ID', readonly=True)
     has_source = fields.Boolean('Mənbə Sənəd Var', compute='_compute_has_source', store=False)
     
+    def init(self):
+        for index_name, (columns, where) in self._CASH_FLOW_INDEXES.items():
+            create_index(self.env.cr, index_name, self._table, columns, where=where)
+        missing = [name for name in self._CASH_FLOW_INDEXES if not index_exists(self.env.cr, name)]
+        if missing:
+            _logger.error("volan.cash.flow indeksləri yaradılmadı: %s", ', '.join(missing))
+
     @api.depends('related_model', 'related_id')
     def _compute_has_source(self):
         """Mənbə sənədin olub-olmadığını yoxla"""
         for record in self:
             record.has_source = bool(record.related_model and record.related_id)
-    
+
+    @api.model
+    def _unlink_for_sources(self, model_name, source_ids, extra_flows=None):
+        """Silinən mənbə sənədlərin kassa əməliyyatlarını bir sorğu ilə tap və sil"""
+        cash_flows = self.search([
+            ('related_model', '=', model_name),
+            ('related_id', 'in', list(source_ids)),
+        ])
+        if extra_flows:
+            cash_flows |= extra_flows
+        if cash_flows:
+            # related_model-i sıfırla ki, unlink qadağası işləməsin
+            cash_flows.write({'related_model': False, 'related_id': False})
+            cash_flows.unlink()
+
     def action_view_source(self):
         """Mənbə sənədə keçid et"""
         self.ensure_one()
         if not self.related_model or not self.related_id:
             raise ValidationError('Bu kassa əməliyyatının mənbə sənədi yoxdur!')
-        
-        # Model adını tap
-        try:
-            model_obj = self.env[self.related_model].browse(self.related_id)
-            if not model_obj.exists():
-                raise ValidationError('Mənbə sənəd tapılmadı! Ola bilsin silinib.')
-        except Exception:
+        if self.related_model not in self.env:
             raise ValidationError(f'Model "{self.related_model}" tapılmadı!')
+
+        model_obj = self.env[self.related_model].browse(self.related_id).exists()
+        if not model_obj:
+            raise ValidationError('Mənbə sənəd tapılmadı! Ola bilsin silinib.')
         
         # Əgər payment modelidirsə, əsas lesson-a keçid et
         target_model = self.related_model
@@ -83,7 +219,29 @@ class CashFlow(models.Model):
                     f'⛔ Bu kassa əməliyyatı "{record.name}" bir sənəd tərəfindən yaradılıb!\n\n'
                     f'Silmək üçün əsas sənədi silməlisiniz.\n'
                 )
+        self.env['volan.cash.daily.summary']._apply_cash_flow_delta(self, sign=-1)
+        self._invalidate_cash_checkpoints()
         return super(CashFlow, self).unlink()
+
+    def write(self, vals):
+        """Məbləğ və ya qruplaşdırma sahələri dəyişəndə günlük xülasəni və checkpoint-ləri yenilə"""
+        summary_obj = self.env['volan.cash.daily.summary']
+        affects_summary = bool(summary_obj._CASH_FLOW_FIELDS.intersection(vals))
+        if affects_summary:
+            summary_obj._apply_cash_flow_delta(self, sign=-1)
+            self._invalidate_cash_checkpoints()
+        res = super(CashFlow, self).write(vals)
+        if affects_summary:
+            summary_obj._apply_cash_flow_delta(self)
+            self._invalidate_cash_checkpoints()
+        return res
+
+    def _invalidate_cash_checkpoints(self):
+        """Bağlanmış aylara düşən əməliyyatlar üçün aylıq checkpoint-ləri sıfırla"""
+        checkpoint_obj = self.env['volan.cash.checkpoint']
+        for sport_type in set(self.mapped('sport_type')):
+            flows = self.filtered(lambda f: f.sport_type == sport_type)
+            checkpoint_obj._invalidate(sport_type, flows.mapped('date'))
     
     #@api.constrains('amount', 'transaction_type')
     #def _check_negative_balance(self):
@@ -110,7 +268,202 @@ class CashFlow(models.Model):
             #        raise ValidationError('Xəbərdarlıq: Yetərsiz balans! Bu xərc əməliyyatı balansı mənfiyə düşürəcək. '
             #                              'Cari balans: {:.2f}, Xərc məbləği: {:.2f}'.format(
             #                                  current_balance, amount))
-        return super(CashFlow, self).create(vals)
+        record = super(CashFlow, self).create(vals)
+        self.env['volan.cash.daily.summary']._apply_cash_flow_delta(record)
+        record._invalidate_cash_checkpoints()
+        return record
+
+
+class CashDailySummary(models.Model):
+    """Kassa axınlarının gün/idman/kateqoriya/əməliyyat üzrə cəmi.
+
+    volan.cash.flow create/write/unlink zamanı eyni tranzaksiyada yenilənir,
+    buna görə dashboard-lar hər əməliyyatı deyil, yalnız günlük sətirləri oxuyur.
+    """
+    _name = 'volan.cash.daily.summary'
+    _description = 'Kassa Günlük Xülasəsi'
+    _order = 'date desc'
+    _sql_constraints = [
+        ('summary_key_unique', 'UNIQUE(date, sport_type, category, transaction_type)',
+         'Hər gün, idman növü, kateqoriya və əməliyyat növü üçün yalnız bir xülasə sətri ola bilər!'),
+    ]
+
+    # Xülasəyə təsir edən volan.cash.flow sahələri
+    _CASH_FLOW_FIELDS = {'date', 'amount', 'transaction_type', 'category', 'sport_type'}
+
+    date = fields.Date('Tarix', required=True, readonly=True, index=True)
+    sport_type = fields.Selection(SPORT_TYPE_SELECTION, string='İdman Növü', required=True, readonly=True)
+    category = fields.Selection(CATEGORY_SELECTION, string='Kateqoriya', required=True, readonly=True)
+    transaction_type = fields.Selection(TRANSACTION_TYPE_SELECTION, string='Əməliyyat Növü', required=True, readonly=True)
+    amount = fields.Float('Məbləğ', readonly=True)
+
+    @api.model
+    def _apply_cash_flow_delta(self, flows, sign=1):
+        """Kassa axınlarının məbləğini günlük sətirlərə əlavə edir (sign=-1 olduqda çıxır)"""
+        deltas = defaultdict(float)
+        for flow in flows:
+            if not flow.date:
+                continue
+            key = (flow.date, flow.sport_type, flow.category, flow.transaction_type)
+            deltas[key] += sign * (flow.amount or 0.0)
+
+        rows = [key + (amount,) for key, amount in deltas.items() if amount]
+        if not rows:
+            return
+
+        placeholders = ', '.join(["(%s, %s, %s, %s, %s, %s, (now() at time zone 'UTC'), %s, (now() at time zone 'UTC'))"] * len(rows))
+        params = []
+        for row in rows:
+            params.extend(row + (self.env.uid, self.env.uid))
+        self.env.cr.execute(f"""
+            INSERT INTO volan_cash_daily_summary
+                (date, sport_type, category, transaction_type, amount,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES {placeholders}
+            ON CONFLICT (date, sport_type, category, transaction_type)
+            DO UPDATE SET amount = volan_cash_daily_summary.amount + EXCLUDED.amount,
+                          write_uid = EXCLUDED.write_uid,
+                          write_date = EXCLUDED.write_date
+        """, params)
+        self.invalidate_model(['amount'])
+
+    @api.model
+    def rebuild(self):
+        """Xülasə cədvəlini volan.cash.flow-dan yenidən qurur (backfill / düzəliş üçün)"""
+        self.env['volan.cash.flow'].flush_model()
+        self.env.cr.execute("DELETE FROM volan_cash_daily_summary")
+        self.env.cr.execute("""
+            INSERT INTO volan_cash_daily_summary
+                (date, sport_type, category, transaction_type, amount,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT date, sport_type, category, transaction_type, SUM(amount),
+                   %s, (now() at time zone 'UTC'), %s, (now() at time zone 'UTC')
+              FROM volan_cash_flow
+             WHERE date IS NOT NULL
+          GROUP BY date, sport_type, category, transaction_type
+        """, (self.env.uid, self.env.uid))
+        self.invalidate_model()
+        return True
+
+    @api.model
+    def _sum_by(self, domain, groupby):
+        """domain üzrə məbləğləri qaytarır: {groupby dəyərləri (tuple): cəm}"""
+        groups = self._read_group(domain, groupby=list(groupby), aggregates=['amount:sum'])
+        return {tuple(group[:-1]): group[-1] or 0.0 for group in groups}
+
+class CashCheckpoint(models.Model):
+    """Bağlanmış ayların sonuna Ümumi Qalıq (idman növü üzrə).
+
+    "Bütün tarixlər" balansı = son checkpoint + ayın əvvəlindən olan fərq.
+    Bağlanmış aya geriyə tarixli ödəniş, satış və ya kassa axını düşəndə
+    həmin tarixdən sonrakı checkpoint-lər silinir və növbəti dəfə yenidən hesablanır.
+    """
+    _name = 'volan.cash.checkpoint'
+    _description = 'Kassa Aylıq Qalıq Checkpoint-i'
+    _order = 'sport_type, month_end desc'
+    _sql_constraints = [
+        ('sport_month_unique', 'UNIQUE(sport_type, month_end)',
+         'Hər idman növü və ay üçün yalnız bir checkpoint ola bilər!'),
+    ]
+
+    # idman növü -> Ümumi Qalığı hesablayan dashboard modeli
+    _BALANCE_MODELS = {
+        'basketball': 'basketball.cash.balance',
+        'badminton': 'badminton.cash.balance',
+    }
+
+    sport_type = fields.Selection(SPORT_TYPE_SELECTION, string='İdman Növü', required=True, readonly=True)
+    month_end = fields.Date('Ayın Son Günü', required=True, readonly=True)
+    balance = fields.Float('Qalıq', readonly=True)
+
+    @api.model
+    def _get_last_closed_month_end(self):
+        return fields.Date.today().replace(day=1) - timedelta(days=1)
+
+    @api.model
+    def _get_balance(self, sport_type, date_to):
+        """date_to daxil olmaqla Ümumi Qalıq: checkpoint + qismən ay fərqi"""
+        anchor = min(date_to.replace(day=1) - timedelta(days=1), self._get_last_closed_month_end())
+        base = self._get_checkpoint_balance(sport_type, anchor)
+        balance_obj = self.env[self._BALANCE_MODELS[sport_type]]
+        return base + balance_obj._compute_overall_total_in_range(anchor + timedelta(days=1), date_to)
+
+    @api.model
+    def _get_checkpoint_balance(self, sport_type, month_end):
+        """Bağlanmış ayın sonuna qalığı qaytarır, yoxdursa ən yaxın əvvəlki checkpoint-dən hesablayıb saxlayır"""
+        cr = self.env.cr
+        cr.execute("""
+            SELECT month_end, balance
+              FROM volan_cash_checkpoint
+             WHERE sport_type = %s AND month_end <= %s
+          ORDER BY month_end DESC
+             LIMIT 1
+        """, (sport_type, month_end))
+        row = cr.fetchone()
+        if row and row[0] == month_end:
+            return row[1]
+
+        if row:
+            base, date_from = row[1], row[0] + timedelta(days=1)
+        else:
+            base, date_from = 0.0, False
+        # Saxlanılan dəyər istifadəçidən asılı olmamalıdır
+        balance_obj = self.env[self._BALANCE_MODELS[sport_type]].sudo()
+        balance = base + balance_obj._compute_overall_total_in_range(date_from, month_end)
+
+        cr.execute("""
+            INSERT INTO volan_cash_checkpoint
+                (sport_type, month_end, balance, create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, %s, (now() at time zone 'UTC'), %s, (now() at time zone 'UTC'))
+            ON CONFLICT (sport_type, month_end) DO NOTHING
+        """, (sport_type, month_end, balance, self.env.uid, self.env.uid))
+        return balance
+
+    @api.model
+    def _invalidate(self, sport_type, dates):
+        """Verilmiş tarixlərin ən kiçiyindən sonrakı checkpoint-ləri silir (metrik keşini də köhnəldir)"""
+        self.env['volan.cash.metrics.cache']._bump_data_version()
+        dates = [d.date() if isinstance(d, datetime) else d for d in dates if d]
+        if sport_type not in self._BALANCE_MODELS or not dates:
+            return
+        self.env.cr.execute(
+            "DELETE FROM volan_cash_checkpoint WHERE sport_type = %s AND month_end >= %s",
+            (sport_type, min(dates)),
+        )
+        self.invalidate_model()
+
+    @api.model
+    def rebuild(self):
+        """Bütün checkpoint-ləri silir; növbəti sorğuda yenidən hesablanacaq"""
+        self.env.cr.execute("DELETE FROM volan_cash_checkpoint")
+        self.invalidate_model()
+        return True
+
+
+class BasketballProductSale(models.Model):
+    _inherit = 'basketball.product.sale'
+
+    def _invalidate_cash_checkpoints(self):
+        """Bağlanmış aya düşən forma satışları üçün aylıq kassa checkpoint-lərini sıfırla"""
+        self.env['volan.cash.checkpoint']._invalidate('basketball', self.mapped('sale_date'))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        sales = super().create(vals_list)
+        sales._invalidate_cash_checkpoints()
+        return sales
+
+    def write(self, vals):
+        # total_amount sətirlərdən hesablandığı üçün istənilən dəyişiklik nəzərə alınır
+        self._invalidate_cash_checkpoints()
+        res = super().write(vals)
+        self._invalidate_cash_checkpoints()
+        return res
+
+    def unlink(self):
+        self._invalidate_cash_checkpoints()
+        return super().unlink()
+
 
 class CashBalance(models.TransientModel):
     _name = 'volan.cash.balance'
@@ -185,45 +538,21 @@ class CashBalance(models.TransientModel):
         if res is None:
             res = {}
             
-        cash_flow_obj = self.env['volan.cash.flow']
-        date_domain = self._get_date_domain()
-        
-        # Badminton satış gəlirləri
-        badminton_sales_domain = [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'badminton_sale')
-        ] + date_domain
-        badminton_sales_income = sum(cash_flow_obj.search(badminton_sales_domain).mapped('amount'))
-        
-        # Badminton dərs gəlirləri
-        badminton_lessons_domain = [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'badminton_lesson')
-        ] + date_domain
-        badminton_lessons_income = sum(cash_flow_obj.search(badminton_lessons_domain).mapped('amount'))
-        
-        # Basketbol dərs gəlirləri
-        basketball_lessons_domain = [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'basketball_lesson')
-        ] + date_domain
-        basketball_lessons_income = sum(cash_flow_obj.search(basketball_lessons_domain).mapped('amount'))
-        
-        # Digər gəlirlər
-        other_income_domain = [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'other')
-        ] + date_domain
-        other_income = sum(cash_flow_obj.search(other_income_domain).mapped('amount'))
-        
+        # Bütün məbləğlər günlük xülasədən tək GROUP BY (transaction_type, category) sorğusu ilə
+        totals = self.env['volan.cash.daily.summary']._sum_by(
+            self._get_date_domain(), ['transaction_type', 'category'])
+
+        badminton_sales_income = totals.get(('income', 'badminton_sale'), 0.0)
+        badminton_lessons_income = totals.get(('income', 'badminton_lesson'), 0.0)
+        basketball_lessons_income = totals.get(('income', 'basketball_lesson'), 0.0)
+        other_income = totals.get(('income', 'other'), 0.0)
+
         # Ümumi gəlir
         total_income = badminton_sales_income + badminton_lessons_income + basketball_lessons_income + other_income
-        
-        # Ümumi xərclər - sadə şəkildə bütün xərcləri hesablayırıq
-        expense_domain = [
-            ('transaction_type', '=', 'expense')
-        ] + date_domain
-        total_expenses = sum(cash_flow_obj.search(expense_domain).mapped('amount'))
+
+        # Ümumi xərclər - kateqoriyadan asılı olmayaraq bütün xərclər
+        total_expenses = sum(amount for (transaction_type, _category), amount in totals.items()
+                             if transaction_type == 'expense')
         
         # Cari balans = Ümumi gəlir - Ümumi xərc
         current_balance = total_income - total_expenses
@@ -280,13 +609,13 @@ class CashBalance(models.TransientModel):
         
     def _calculate_current_balance(self):
         """Cari balansı hesablayır"""
-        cash_flow_obj = self.env['volan.cash.flow']
+        totals = self.env['volan.cash.daily.summary']._sum_by([], ['transaction_type'])
         
         # Gəlirlər
-        income = sum(cash_flow_obj.search([('transaction_type', '=', 'income')]).mapped('amount'))
+        income = totals.get(('income',), 0.0)
         
         # Xərclər
-        expenses = sum(cash_flow_obj.search([('transaction_type', '=', 'expense')]).mapped('amount'))
+        expenses = totals.get(('expense',), 0.0)
         
         return income - expenses
 
@@ -357,9 +686,29 @@ class CashBalance(models.TransientModel):
             setattr(self, field, value)
 
 
-class BasketballCashBalance(models.TransientModel):
-    _name = 'basketball.cash.balance'
-    _description = 'Basketbol Kassa Balansı'
+class CashDashboard(models.AbstractModel):
+    """Basketbol və badminton kassa dashboard-larının ortaq metrik mühərriki.
+
+    Hər dashboard _metric_providers siyahısında provider-lərini elan edir (_metric_<ad> metodları,
+    ardıcıllıqla çağırılır və əvvəlkilərin nəticəsini ctx['metrics']-dən oxuya bilir).
+    Provider-lər məlumatı _scan_* metodları ilə oxuyur: eyni cədvəl və interval üçün sorğu
+    bir dəfə icra olunur və nəticəsi bütün provider-lər arasında bölüşdürülür.
+    """
+    _name = 'volan.cash.dashboard'
+    _description = 'Kassa Dashboard Mühərriki'
+
+    # ---------- Dashboard konfiqurasiyası (alt modellər təyin edir) ----------
+    _cash_sport_type = None
+    _default_date_filter = 'custom'
+    _metric_providers = ('subscription', 'sales', 'other', 'children', 'overall', 'cashbox')
+    _payment_model = None
+    _lesson_model = None
+    _sale_model = None
+    _sale_state = None
+    _sale_date_field = None
+    _sale_amount_field = None
+    _sale_methods = ('cash', 'card')
+    _sale_metric_prefix = None
 
     date_filter = fields.Selection([
         #('all', 'Bütün Tarixlər'),
@@ -377,11 +726,6 @@ class BasketballCashBalance(models.TransientModel):
     subscription_card_amount = fields.Float('💳 Abunəlik Kart', readonly=True)
     subscription_total_amount = fields.Float('💰 Abunəlik Ümumi', readonly=True)
 
-    uniform_cash_amount = fields.Float('💵 Forma Nağd', readonly=True)
-    uniform_card_amount = fields.Float('💳 Forma Kart', readonly=True)
-    uniform_total_amount = fields.Float('💰 Forma Ümumi', readonly=True)
-    uniform_total_quantity = fields.Integer('🎽 Satılan Forma Sayı', readonly=True)
-
     other_income_amount = fields.Float('💼 Mədaxil', readonly=True)
     other_expense_amount = fields.Float('📉 Məxaric', readonly=True)
     other_net_amount = fields.Float('🧾 Net Nəticə', readonly=True)
@@ -395,15 +739,20 @@ class BasketballCashBalance(models.TransientModel):
                                    help='Kassa Balansı - seçilmiş tarix aralığındakı Ümumi Qalıq')
     total_children_count = fields.Integer('👥 Ümumi Uşaq', readonly=True)
     new_children_count = fields.Integer('🆕 Yeni Uşaq', readonly=True)
-    
-    # Gecikmiş ödənişlər
-    delayed_payments_amount = fields.Float('⏰ Gecikmiş Ödənişlər', readonly=True, 
-                                          help="Real_date bu tarix aralığında olmayan ama payment_date bu tarix aralığında olan ödənişlərin cəmi")
-    
+
+    delayed_payments_amount = fields.Float('⏰ Gecikmiş Ödənişlər', readonly=True)
+
     # Gecikməyən ödənişlər (məlumat xarakterli)
     ontime_payments_amount = fields.Float('✅ Aylıq net nəticə', readonly=True, compute='_compute_ontime_payments',
                                          help="Abunəlik Ümumi - Gecikmiş Ödənişlər")
 
+    # Arxa fonda yeniləmə (bax: volan.cash.dashboard.snapshot)
+    snapshot_computed_at = fields.Datetime('🕒 Son Hesablama', readonly=True,
+                                           help='Göstərilən rəqəmlərin hesablandığı vaxt')
+    refresh_pending = fields.Boolean('⏳ Yenilənir', readonly=True)
+
+    _DEFAULT_ASYNC_REFRESH_DAYS = 62
+
     @api.model
     def default_get(self, fields_list):
         res = super().default_get(fields_list)
@@ -414,20 +763,21 @@ class BasketballCashBalance(models.TransientModel):
         metrics = self._gather_metrics(override=res)
         res.update(metrics)
         return res
-    
+
     @api.depends('subscription_total_amount', 'delayed_payments_amount')
     def _compute_ontime_payments(self):
         """Gecikməyən ödənişləri hesabla: Abunəlik Ümumi - Gecikmiş Ödənişlər"""
         for record in self:
             record.ontime_payments_amount = record.subscription_total_amount - record.delayed_payments_amount
 
+    # ---------- Tarix filtri ----------
     def _resolve_filter_state(self, override=None):
         if override:
-            date_filter = override.get('date_filter') or 'month'
+            date_filter = override.get('date_filter') or self._default_date_filter
             date_from = override.get('date_from')
             date_to = override.get('date_to')
         else:
-            date_filter = self.date_filter or 'month'
+            date_filter = self.date_filter or self._default_date_filter
             date_from = self.date_from
             date_to = self.date_to
         return {
@@ -460,206 +810,20 @@ class BasketballCashBalance(models.TransientModel):
         start = today.replace(day=1)
         return (start, today)
 
-    def _build_payment_domain(self, date_from, date_to):
-        if not date_from or not date_to:
-            return []
-        real_domain = [
-            ('real_date', '!=', False),
-            ('real_date', '>=', date_from),
-            ('real_date', '<=', date_to),
-        ]
-        legacy_domain = [
-            ('real_date', '=', False),
-            ('payment_date', '>=', date_from),
-            ('payment_date', '<=', date_to),
-        ]
-        return OR([real_domain, legacy_domain])
-
-    def _empty_subscription_metrics(self):
-        return {
-            'subscription_cash_amount': 0.0,
-            'subscription_card_amount': 0.0,
-            'subscription_total_amount': 0.0,
-        }
-
-    def _empty_uniform_metrics(self):
-        return {
-            'uniform_cash_amount': 0.0,
-            'uniform_card_amount': 0.0,
-            'uniform_total_amount': 0.0,
-            'uniform_total_quantity': 0,
-        }
-
-    def _empty_other_metrics(self):
-        return {
-            'other_income_amount': 0.0,
-            'other_expense_amount': 0.0,
-            'other_net_amount': 0.0,
-        }
-
-    def _empty_overall_metrics(self):
-        return {
-            'overall_cash_income': 0.0,
-            'overall_card_income': 0.0,
-            'overall_total_income': 0.0,
-        }
-
-    def _empty_child_metrics(self):
-        return {
-            'total_children_count': 0,
-            'new_children_count': 0,
-        }
-
-    def _get_subscription_payment_sets(self, date_from, date_to):
-        """
-        Seçilmiş interval üçün 3 dəst qaytarır:
-        - timely: payment_date intervalda olanlar
-        - delayed:
-            * əgər interval eyni ay içindədirsə → real_date intervalda,
-                payment_date isə həmin AY-dan kənardadır
-            * əgər interval bir neçə ayı əhatə edirsə → real_date intervalda,
-                payment_date isə intervaldan kənardadır
-        - all_for_report: timely ∪ delayed  (Abunəlik Ümumi üçün)
-        """
-        payment_obj = self.env['basketball.lesson.payment']
-
-        if not date_from or not date_to:
-            empty = payment_obj.browse([])
-            return {
-                'timely': empty,
-                'delayed': empty,
-                'all_for_report': empty,
-            }
-
-        # 1️⃣ Seçilmiş intervalda payment_date
-        timely = payment_obj.search([
-            ('payment_date', '>=', date_from),
-            ('payment_date', '<=', date_to),
-        ])
-
-        # 2️⃣ Seçilmiş intervalda real_date
-        payments_real = payment_obj.search([
-            ('real_date', '>=', date_from),
-            ('real_date', '<=', date_to),
-            ('real_date', '!=', False),
-        ])
-
-        # 3️⃣ Interval eyni aya düşür, ya yox?
-        same_month = (
-            date_from.year == date_to.year
-            and date_from.month == date_to.month
-        )
-
-        if same_month:
-            # Məs: 4–6 oktyabr → burada 1–31 oktyabr istifadə olunur
-            month_start = date_from.replace(day=1)
-            month_end = month_start + relativedelta(months=1, days=-1)
-
-            delayed = payments_real.filtered(lambda p:
-                not p.payment_date or
-                p.payment_date < month_start or
-                p.payment_date > month_end
-            )
-        else:
-            # Məs: 1 sentyabr – 20 dekabr → bütün intervala baxırıq
-            delayed = payments_real.filtered(lambda p:
-                not p.payment_date or
-                p.payment_date < date_from or
-                p.payment_date > date_to
-            )
-
-        all_for_report = timely | delayed
-
-        return {
-            'timely': timely,
-            'delayed': delayed,
-            'all_for_report': all_for_report,
-        }
-
-
-    def _compute_delayed_payments(self, override=None):
-        """
-        Gecikmiş ödənişləri hesabla:
-        real_date seçilmiş tarix intervalında,
-        payment_date isə həmin intervalın AYI üzrə deyil (başqa aydadır).
-        """
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return {'delayed_payments_amount': 0.0}
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return {'delayed_payments_amount': 0.0}
-
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        delayed_payments = sets['delayed']
-
-        delayed_amount = sum(delayed_payments.mapped('amount'))
-        return {'delayed_payments_amount': delayed_amount}
-
-    def _compute_subscription_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_subscription_metrics()
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return self._empty_subscription_metrics()
-
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        all_payments = sets['all_for_report']
-
-        cash_amount = sum(all_payments.filtered(
-            lambda p: p.payment_method_lesson == 'cash'
-        ).mapped('amount'))
-
-        card_amount = sum(all_payments.filtered(
-            lambda p: p.payment_method_lesson == 'card'
-        ).mapped('amount'))
-
-        total_amount = cash_amount + card_amount
-
-        return {
-            'subscription_cash_amount': cash_amount,
-            'subscription_card_amount': card_amount,
-            'subscription_total_amount': total_amount,
-        }
-
+    # ---------- Domain-lər ----------
     def _build_sale_domain(self, date_from, date_to):
-        domain = [('state', '=', 'confirmed')]
+        domain = [('state', '=', self._sale_state)]
         if date_from and date_to:
             start_dt = datetime.combine(date_from, datetime.min.time())
             end_dt = datetime.combine(date_to, datetime.max.time())
             domain += [
-                ('sale_date', '>=', start_dt),
-                ('sale_date', '<=', end_dt),
+                (self._sale_date_field, '>=', start_dt),
+                (self._sale_date_field, '<=', end_dt),
             ]
         return domain
 
-    def _compute_uniform_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_uniform_metrics()
-
-        date_from, date_to = self._get_date_range(state)
-        sale_domain = self._build_sale_domain(date_from, date_to)
-        sale_obj = self.env['basketball.product.sale']
-        sales = sale_obj.search(sale_domain)
-
-        cash_amount = sum(sales.filtered(lambda s: s.payment_method == 'cash').mapped('total_amount'))
-        card_amount = sum(sales.filtered(lambda s: s.payment_method == 'card').mapped('total_amount'))
-        total_amount = cash_amount + card_amount
-        total_quantity = sum(sales.mapped('sale_line_ids.quantity'))
-
-        return {
-            'uniform_cash_amount': cash_amount,
-            'uniform_card_amount': card_amount,
-            'uniform_total_amount': total_amount,
-            'uniform_total_quantity': int(total_quantity),
-        }
-
     def _build_cash_flow_domain(self, date_from, date_to):
-        domain = [('sport_type', '=', 'basketball')]
+        domain = [('sport_type', '=', self._cash_sport_type)]
         if date_from and date_to:
             domain += [
                 ('date', '>=', date_from),
@@ -667,159 +831,325 @@ class BasketballCashBalance(models.TransientModel):
             ]
         return domain
 
-    def _compute_other_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_other_metrics()
+    def _build_effective_payment_domain(self, date_from, date_to):
+        """Ödənişin Ümumi Qalığa düşdüyü gün = min(payment_date, real_date).
+        Bu tarixi [date_from, date_to] aralığında olan ödənişlər (date_from=False → əvvəldən)."""
+        if not date_from:
+            return ['|', ('payment_date', '<=', date_to),
+                    '&', ('real_date', '!=', False), ('real_date', '<=', date_to)]
+        return OR([
+            [('payment_date', '>=', date_from), ('payment_date', '<=', date_to),
+             '|', ('real_date', '=', False), ('real_date', '>=', date_from)],
+            [('real_date', '!=', False), ('real_date', '>=', date_from), ('real_date', '<=', date_to),
+             ('payment_date', '>=', date_from)],
+        ])
 
-        date_from, date_to = self._get_date_range(state)
-        base_domain = self._build_cash_flow_domain(date_from, date_to)
-        cash_flow_obj = self.env['volan.cash.flow']
+    # ---------- Abunəlik dəstləri ----------
+    def _subscription_delayed_window(self, date_from, date_to):
+        """Gecikmiş sayılmaması üçün payment_date-in düşməli olduğu interval: date_from-un ayı"""
+        month_start = date_from.replace(day=1)
+        return month_start, month_start + relativedelta(months=1, days=-1)
 
-        income_domain = base_domain + [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'other'),
-        ]
-        expense_domain = base_domain + [
-            ('transaction_type', '=', 'expense'),
-            ('category', '=', 'other'),
-        ]
+    def _get_subscription_payment_sets(self, date_from, date_to, with_ids=False):
+        """Seçilmiş interval üçün 3 dəst qaytarır (bax: _query_subscription_payment_buckets):
+        - timely: payment_date intervalda olanlar
+        - delayed: real_date intervalda, payment_date isə _subscription_delayed_window-dan kənar olanlar
+        - all_for_report: timely ∪ delayed  (Abunəlik Ümumi üçün)
+        """
+        if not date_from or not date_to:
+            return _query_subscription_payment_buckets(self.env, self._payment_model, False, False, False, False)
 
-        income_amount = sum(cash_flow_obj.search(income_domain).mapped('amount'))
-        expense_amount = sum(cash_flow_obj.search(expense_domain).mapped('amount'))
-        net_amount = income_amount - expense_amount
+        delayed_start, delayed_end = self._subscription_delayed_window(date_from, date_to)
+        return _query_subscription_payment_buckets(
+            self.env, self._payment_model, date_from, date_to,
+            delayed_start, delayed_end, with_ids=with_ids,
+        )
 
+    # ---------- Ortaq sorğular (scan) ----------
+    def _scan(self, ctx, key, compute):
+        """Eyni açarlı sorğunu bir hesablama daxilində yalnız bir dəfə icra et"""
+        scans = ctx['scans']
+        if key not in scans:
+            scans[key] = compute()
+        return scans[key]
+
+    def _scan_subscription(self, ctx):
+        date_from, date_to = ctx['date_from'], ctx['date_to']
+        return self._scan(ctx, ('subscription', date_from, date_to),
+                          lambda: self._get_subscription_payment_sets(date_from, date_to))
+
+    def _scan_sales(self, ctx):
+        """{ödəniş metodu: məbləğ} - satış cədvəlinə bir qruplaşdırılmış sorğu"""
+        date_from, date_to = ctx['date_from'], ctx['date_to']
+
+        def compute():
+            if not date_from or not date_to:
+                return {}
+            return dict(self.env[self._sale_model]._read_group(
+                self._build_sale_domain(date_from, date_to),
+                groupby=['payment_method'],
+                aggregates=[f'{self._sale_amount_field}:sum'],
+            ))
+        return self._scan(ctx, ('sales', date_from, date_to), compute)
+
+    def _scan_cash_summary(self, ctx):
+        """{(transaction_type, category): məbləğ} - gündəlik kassa cəmlərinə bir sorğu"""
+        date_from, date_to = ctx['date_from'], ctx['date_to']
+
+        def compute():
+            if not date_from or not date_to:
+                return {}
+            return self.env['volan.cash.daily.summary']._sum_by(
+                self._build_cash_flow_domain(date_from, date_to), ['transaction_type', 'category'])
+        return self._scan(ctx, ('cash_summary', date_from, date_to), compute)
+
+    # ---------- Metrik provider-ləri ----------
+    def _metric_subscription(self, ctx):
+        sets = self._scan_subscription(ctx)
+        cash_amount = sets['all_for_report']['cash']
+        card_amount = sets['all_for_report']['card']
         return {
-            'other_income_amount': income_amount,
-            'other_expense_amount': expense_amount,
-            'other_net_amount': net_amount,
+            'subscription_cash_amount': cash_amount,
+            'subscription_card_amount': card_amount,
+            'subscription_total_amount': cash_amount + card_amount,
+            'delayed_payments_amount': sets['delayed']['total'],
         }
 
-    def _compute_child_metrics(self, override=None):
-        lesson_obj = self.env['basketball.lesson.simple']
-        # Yalnız aktiv abunəlikləri say
-        all_lessons = lesson_obj.search([('state', '=', 'active')])
-        total_children = len(set(all_lessons.mapped('partner_id').ids))
-
-        state = self._resolve_filter_state(override)
-        date_from, date_to = self._get_date_range(state)
+    def _metric_sales(self, ctx):
+        totals = self._scan_sales(ctx)
+        prefix = self._sale_metric_prefix
+        metrics = {f'{prefix}_{method}_amount': totals.get(method) or 0.0 for method in self._sale_methods}
+        metrics[f'{prefix}_total_amount'] = sum(metrics.values())
+        return metrics
 
-        new_children = 0
-        if date_from and date_to:
-            lessons_in_range = lesson_obj.search([
-                ('payment_date', '>=', date_from),
-                ('payment_date', '<=', date_to),
-            ])
-            range_partners = set(lessons_in_range.mapped('partner_id').ids)
-            if date_from:
-                earlier_lessons = lesson_obj.search([('payment_date', '<', date_from)])
-                earlier_partners = set(earlier_lessons.mapped('partner_id').ids)
-            else:
-                earlier_partners = set()
-            new_children = len(range_partners - earlier_partners)
+    def _metric_other(self, ctx):
+        totals = self._scan_cash_summary(ctx)
+        income_amount = totals.get(('income', 'other'), 0.0)
+        expense_amount = totals.get(('expense', 'other'), 0.0)
+        return {
+            'other_income_amount': income_amount,
+            'other_expense_amount': expense_amount,
+            'other_net_amount': income_amount - expense_amount,
+        }
 
+    def _metric_children(self, ctx):
+        # Aktiv abunəlikli müştərilər və ilk abunəliyi intervala düşənlər - tək sorğu
+        total_children, new_children = _query_child_counts(
+            self.env, self._lesson_model, ctx['date_from'], ctx['date_to'])
         return {
             'total_children_count': total_children,
             'new_children_count': new_children,
         }
 
-    def _compute_overall_metrics(self, metrics):
-        cash_income = metrics.get('subscription_cash_amount', 0.0) + metrics.get('uniform_cash_amount', 0.0)
-        card_income = metrics.get('subscription_card_amount', 0.0) + metrics.get('uniform_card_amount', 0.0)
-        total_income = cash_income + card_income + metrics.get('other_income_amount', 0.0) - metrics.get('other_expense_amount', 0.0)
-
+    def _metric_overall(self, ctx):
+        metrics = ctx['metrics']
+        prefix = self._sale_metric_prefix
+        cash_income = metrics.get('subscription_cash_amount', 0.0) + metrics.get(f'{prefix}_cash_amount', 0.0)
+        card_income = metrics.get('subscription_card_amount', 0.0) + metrics.get(f'{prefix}_card_amount', 0.0)
+        # Nağd/kartdan başqa satış metodları (məs. abunəçi) yalnız ümumi qalığa düşür
+        other_sales = sum(metrics.get(f'{prefix}_{method}_amount', 0.0)
+                          for method in self._sale_methods if method not in ('cash', 'card'))
+        total_income = (cash_income + card_income + other_sales +
+                        metrics.get('other_income_amount', 0.0)) - metrics.get('other_expense_amount', 0.0)
         return {
             'overall_cash_income': cash_income,
             'overall_card_income': card_income,
             'overall_total_income': total_income,
         }
 
-    def _compute_all_time_overall_total(self, date_to):
-        """Ümumi Qalıq dəyərini 0-cı ildən seçilmiş tarix aralığının sonuna qədər hesabla."""
-        payment_obj = self.env['basketball.lesson.payment']
-        
-        # payment_date və ya real_date seçilmiş tarix aralığının sonuna qədər olan ödənişlər
-        payment_date_payments = payment_obj.search([('payment_date', '<=', date_to)])
-        real_date_payments = payment_obj.search([
-            ('real_date', '<=', date_to),
-            ('real_date', '!=', False)
-        ])
-        all_payments = payment_date_payments | real_date_payments
-        
-        subscription_cash = sum(all_payments.filtered(lambda p: p.payment_method_lesson == 'cash').mapped('amount'))
-        subscription_card = sum(all_payments.filtered(lambda p: p.payment_method_lesson == 'card').mapped('amount'))
-
-        sale_obj = self.env['basketball.product.sale']
-        end_dt = datetime.combine(date_to, datetime.max.time())
-        sales = sale_obj.search([('state', '=', 'confirmed'), ('sale_date', '<=', end_dt)])
-        uniform_cash = sum(sales.filtered(lambda s: s.payment_method == 'cash').mapped('total_amount'))
-        uniform_card = sum(sales.filtered(lambda s: s.payment_method == 'card').mapped('total_amount'))
-
-        cash_flow_obj = self.env['volan.cash.flow']
-        other_income = sum(cash_flow_obj.search([
-            ('sport_type', '=', 'basketball'),
-            ('category', '=', 'other'),
-            ('transaction_type', '=', 'income'),
-            ('date', '<=', date_to),
-        ]).mapped('amount'))
-        
-        # Xərcləri çıxırıq
-        other_expense = sum(cash_flow_obj.search([
-            ('sport_type', '=', 'basketball'),
-            ('transaction_type', '=', 'expense'),
-            ('date', '<=', date_to),
-        ]).mapped('amount'))
-
-        return subscription_cash + subscription_card + uniform_cash + uniform_card + other_income - other_expense
-
-    def _compute_cashbox_metrics(self, metrics, override=None):
-        state = self._resolve_filter_state(override)
-        date_from, date_to = self._get_date_range(state)
-        
+    def _metric_cashbox(self, ctx):
+        date_from, date_to = ctx['date_from'], ctx['date_to']
         if not date_to:
             date_to = fields.Date.today()
-            
+
         all_time_total = self._compute_all_time_overall_total(date_to)
-        
+
         # İlkin Qalıq = seçilmiş intervaldan ƏVVƏL olan balans
         if date_from:
-            date_before = date_from - timedelta(days=1)
-            initial_balance = self._compute_all_time_overall_total(date_before)
+            initial_balance = self._compute_all_time_overall_total(date_from - timedelta(days=1))
         else:
             initial_balance = 0.0
-        
+
         return {
             'cashbox_balance': all_time_total,
             'initial_balance': initial_balance,
             'overall_total_income': all_time_total,  # Ümumi Qalıq = Son Qalıq
         }
 
-    def _gather_metrics(self, override=None):
-        metrics = {}
-        metrics.update(self._compute_subscription_metrics(override=override))
-        metrics.update(self._compute_uniform_metrics(override=override))
-        metrics.update(self._compute_other_metrics(override=override))
-        metrics.update(self._compute_child_metrics(override=override))
-        metrics.update(self._compute_delayed_payments(override=override))
-        metrics.update(self._compute_overall_metrics(metrics))
-        metrics.update(self._compute_cashbox_metrics(metrics, override=override))
-        return metrics
+    # ---------- Ümumi Qalıq ----------
+    def _compute_overall_total_in_range(self, date_from, date_to):
+        """[date_from, date_to] aralığında Ümumi Qalığa düşən hərəkətlərin cəmi (date_from=False → əvvəldən)."""
+        if date_from and date_from > date_to:
+            return 0.0
+
+        payment_totals = dict(self.env[self._payment_model]._read_group(
+            self._build_effective_payment_domain(date_from, date_to),
+            groupby=['payment_method_lesson'],
+            aggregates=['amount:sum'],
+        ))
+        subscription_total = (payment_totals.get('cash') or 0.0) + (payment_totals.get('card') or 0.0)
+
+        sale_domain = [('state', '=', self._sale_state),
+                       (self._sale_date_field, '<=', datetime.combine(date_to, datetime.max.time()))]
+        if date_from:
+            sale_domain.append((self._sale_date_field, '>=', datetime.combine(date_from, datetime.min.time())))
+        sale_totals = dict(self.env[self._sale_model]._read_group(
+            sale_domain, groupby=['payment_method'], aggregates=[f'{self._sale_amount_field}:sum'],
+        ))
+        sale_total = sum(sale_totals.get(method) or 0.0 for method in self._sale_methods)
+
+        cash_domain = [('sport_type', '=', self._cash_sport_type), ('date', '<=', date_to)]
+        if date_from:
+            cash_domain.append(('date', '>=', date_from))
+        cash_totals = self.env['volan.cash.daily.summary']._sum_by(cash_domain, ['transaction_type', 'category'])
+        other_income = cash_totals.get(('income', 'other'), 0.0)
+
+        # Xərcləri çıxırıq (kateqoriyadan asılı olmayaraq)
+        other_expense = sum(amount for (transaction_type, _category), amount in cash_totals.items()
+                            if transaction_type == 'expense')
+
+        return subscription_total + sale_total + other_income - other_expense
+
+    def _compute_all_time_overall_total(self, date_to):
+        """Ümumi Qalıq dəyərini 0-cı ildən seçilmiş tarix aralığının sonuna qədər hesabla.
+        Bağlanmış aylar üçün volan.cash.checkpoint, cari ay üçün qismən fərq istifadə olunur."""
+        return self.env['volan.cash.checkpoint']._get_balance(self._cash_sport_type, date_to)
+
+    # ---------- Zaman seriyası (qrafiklər üçün) ----------
+    _SERIES_INTERVALS = {
+        'day': relativedelta(days=1),
+        'week': relativedelta(weeks=1),
+        'month': relativedelta(months=1),
+        'quarter': relativedelta(months=3),
+        'year': relativedelta(years=1),
+    }
+
+    @api.model
+    def get_revenue_series(self, date_from, date_to, interval='month'):
+        """[date_from, date_to] üçün interval üzrə (date_trunc) gəlir seriyası.
+
+        Hər mənbəyə bir qruplaşdırılmış sorğu: kassa cəmləri (mədaxil/məxaric), abunəlik ödənişləri
+        (real_date - kassaya düşdüyü gün) və satışlar. Boş intervallar 0 ilə doldurulur.
+        Nəticə: [{'bucket', 'income', 'expense', 'net', 'subscription', 'sales'}, ...]
+        """
+        if interval not in self._SERIES_INTERVALS:
+            raise ValidationError(f'Yanlış interval: {interval}')
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if not date_from or not date_to or date_from > date_to:
+            return []
+
+        def to_bucket(value):
+            # datetime sahələri üçün _read_group datetime qaytarır
+            return value.date() if isinstance(value, datetime) else value
+
+        series = {}
+        bucket = date_utils.start_of(date_from, interval)
+        while bucket <= date_to:
+            series[bucket] = {'bucket': fields.Date.to_string(bucket), 'income': 0.0, 'expense': 0.0,
+                              'net': 0.0, 'subscription': 0.0, 'sales': 0.0}
+            bucket += self._SERIES_INTERVALS[interval]
+
+        cash_rows = self.env['volan.cash.daily.summary']._read_group(
+            self._build_cash_flow_domain(date_from, date_to),
+            groupby=[f'date:{interval}', 'transaction_type'],
+            aggregates=['amount:sum'],
+        )
+        for bucket, transaction_type, amount in cash_rows:
+            row = series.get(to_bucket(bucket))
+            if row and transaction_type in ('income', 'expense'):
+                row[transaction_type] += amount or 0.0
+
+        payment_rows = self.env[self._payment_model]._read_group(
+            [('real_date', '>=', date_from), ('real_date', '<=', date_to)],
+            groupby=[f'real_date:{interval}'],
+            aggregates=['amount:sum'],
+        )
+        for bucket, amount in payment_rows:
+            row = series.get(to_bucket(bucket))
+            if row:
+                row['subscription'] += amount or 0.0
+
+        sale_rows = self.env[self._sale_model]._read_group(
+            self._build_sale_domain(date_from, date_to) + [('payment_method', 'in', list(self._sale_methods))],
+            groupby=[f'{self._sale_date_field}:{interval}'],
+            aggregates=[f'{self._sale_amount_field}:sum'],
+        )
+        for bucket, amount in sale_rows:
+            row = series.get(to_bucket(bucket))
+            if row:
+                row['sales'] += amount or 0.0
+
+        for row in series.values():
+            row['net'] = row['income'] - row['expense']
+        return list(series.values())
+
+    # ---------- Mühərrik ----------
+    def _gather_metrics(self, override=None, force=False):
+        """Metrikləri keşdən qaytarır; force=True olduqda keşi keçib yenidən hesablayır"""
+        state = self._resolve_filter_state(override)
+        date_from, date_to = self._get_date_range(state)
+        cache = self.env['volan.cash.metrics.cache']
+        key = cache._make_key(self._name, state['date_filter'], date_from, date_to)
+        return cache.get_or_compute(key, lambda: self._compute_all_metrics(override=override), force=force)
+
+    def _compute_all_metrics(self, override=None):
+        state = self._resolve_filter_state(override)
+        date_from, date_to = self._get_date_range(state)
+        ctx = {
+            'state': state,
+            'date_from': date_from,
+            'date_to': date_to,
+            'scans': {},
+            'metrics': {},
+        }
+        for provider in self._metric_providers:
+            ctx['metrics'].update(getattr(self, f'_metric_{provider}')(ctx))
+        return ctx['metrics']
+
+    def _is_long_range(self, date_from, date_to):
+        """Uzun interval (və ya "bütün tarixlər") arxa fonda hesablanır"""
+        if not date_from or not date_to:
+            return True
+        max_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'volan_yasamal.cash_async_refresh_days', self._DEFAULT_ASYNC_REFRESH_DAYS))
+        return (date_to - date_from).days > max_days
 
     def action_refresh(self):
-        metrics = self._gather_metrics()
-        self.write(metrics)
+        # "Yenilə" düyməsi həmişə keşi keçir; uzun intervallar worker-i bloklamasın deyə arxa fonda
+        state = self._resolve_filter_state()
+        date_from, date_to = self._get_date_range(state)
+        if self._is_long_range(date_from, date_to):
+            return self.action_refresh_async()
+        metrics = self._gather_metrics(force=True)
+        self.write(dict(metrics, snapshot_computed_at=fields.Datetime.now(), refresh_pending=False))
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
+
+    def action_refresh_async(self):
+        """Son snapshot-u dərhal göstər, yeni hesablamanı arxa fona göndər.
+        Nəticə hazır olanda qeydə yazılır və forma bus ilə yenilənir."""
+        self.ensure_one()
+        state = self._resolve_filter_state()
+        date_from, date_to = self._get_date_range(state)
+        snapshot = self.env['volan.cash.dashboard.snapshot']._enqueue(
+            self, state['date_filter'], date_from, date_to)
+
+        vals = {'refresh_pending': True}
+        if snapshot.metrics:
+            vals.update(snapshot.metrics)
+            vals['snapshot_computed_at'] = snapshot.computed_at
+        self.write(vals)
         return {'type': 'ir.actions.client', 'tag': 'reload'}
 
     @api.onchange('date_filter', 'date_from', 'date_to')
     def _onchange_date_filter(self):
-        if self.date_filter == 'custom' and (not self.date_from or not self.date_to):
+        state = self._resolve_filter_state()
+        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
             return
         metrics = self._gather_metrics()
         for field_name, value in metrics.items():
             setattr(self, field_name, value)
 
-    # ... sənin mövcud field və metodların burada qalır ...
-
     # ---------- Helpers ----------
     def _ensure_one_and_get_range(self):
         self.ensure_one()
@@ -827,132 +1157,160 @@ class BasketballCashBalance(models.TransientModel):
         date_from, date_to = self._get_date_range(state)
         return date_from, date_to
 
-    def _act_window(self, name, res_model, domain):
+    def _act_window(self, name, res_model, domain, context=None):
+        ctx = dict(self.env.context)
+        if context:
+            ctx.update(context)
         return {
             "type": "ir.actions.act_window",
             "name": name,
             "res_model": res_model,
             "view_mode": "list,form",
-            "views": [(False, "list"), (False, "form")],  # bunu mütləq əlavə et
+            "views": [(False, "list"), (False, "form")],
             "target": "current",
             "domain": domain,
-            "context": dict(self.env.context),
+            "context": ctx,
         }
 
-    # ---------- Abunəlik (basketball.lesson.payment) ----------
-    def action_view_subscription_cash(self):
+    # ---------- Abunəlik drill-down ----------
+    def _act_window_subscription(self, title, bucket, method=None):
         date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets['all_for_report'].filtered(lambda p: p.payment_method_lesson == 'cash')
-        return self._act_window('Abunəlik Nağd Ödənişləri', 'basketball.lesson.payment', [('id', 'in', payments.ids)])
+        sets = self._get_subscription_payment_sets(date_from, date_to, with_ids=True)
+        payment_ids = _bucket_ids(sets[bucket], method)
+        return self._act_window(title, self._payment_model, [('id', 'in', payment_ids)])
+
+    def action_view_subscription_cash(self):
+        return self._act_window_subscription('Abunəlik Nağd Ödənişləri', 'all_for_report', 'cash')
 
     def action_view_subscription_card(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets['all_for_report'].filtered(lambda p: p.payment_method_lesson == 'card')
-        return self._act_window('Abunəlik Kart Ödənişləri', 'basketball.lesson.payment', [('id', 'in', payments.ids)])
+        return self._act_window_subscription('Abunəlik Kart Ödənişləri', 'all_for_report', 'card')
 
     def action_view_subscription_total(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets['all_for_report']
-        return self._act_window('Abunəlik Ödənişləri (Ümumi)', 'basketball.lesson.payment', [('id', 'in', payments.ids)])
+        return self._act_window_subscription('Abunəlik Ödənişləri (Ümumi)', 'all_for_report')
 
     def action_view_delayed_payments(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets['delayed']
-        return self._act_window('Gecikmiş Ödənişlər', 'basketball.lesson.payment', [('id', 'in', payments.ids)])
-
-    # ---------- Forma (basketball.product.sale) ----------
-    def action_view_uniform_cash(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_sale_domain(date_from, date_to) + [('payment_method', '=', 'cash')]
-        return self._act_window('Forma Satışları (Nağd)', 'basketball.product.sale', domain)
+        return self._act_window_subscription('Gecikmiş Ödənişlər', 'delayed')
 
-    def action_view_uniform_card(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_sale_domain(date_from, date_to) + [('payment_method', '=', 'card')]
-        return self._act_window('Forma Satışları (Kart)', 'basketball.product.sale', domain)
-
-    def action_view_uniform_total(self):
+    # ---------- Satış drill-down ----------
+    def _act_window_sales(self, title, method=None):
         date_from, date_to = self._ensure_one_and_get_range()
         domain = self._build_sale_domain(date_from, date_to)
-        return self._act_window('Forma Satışları (Ümumi)', 'basketball.product.sale', domain)
+        if method:
+            domain += [('payment_method', '=', method)]
+        return self._act_window(title, self._sale_model, domain)
 
     # ---------- Digər mədaxil/məxaric (volan.cash.flow) ----------
-    def action_view_other_income(self):
+    def _act_window_other(self, title, transaction_type=None):
         date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_cash_flow_domain(date_from, date_to) + [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'other'),
-        ]
-        return self._act_window('Digər Mədaxillər', 'volan.cash.flow', domain)
+        domain = self._build_cash_flow_domain(date_from, date_to) + [('category', '=', 'other')]
+        if transaction_type:
+            domain += [('transaction_type', '=', transaction_type)]
+        return self._act_window(title, 'volan.cash.flow', domain,
+                                context={'default_sport_type': self._cash_sport_type})
+
+    def action_view_other_income(self):
+        return self._act_window_other('Digər Mədaxillər', 'income')
 
     def action_view_other_expense(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_cash_flow_domain(date_from, date_to) + [
-            ('transaction_type', '=', 'expense'),
-            ('category', '=', 'other'),
-        ]
-        return self._act_window('Digər Məxariclər', 'volan.cash.flow', domain)
+        return self._act_window_other('Digər Məxariclər', 'expense')
 
     def action_view_other_net(self):
         # Net üçün 2 model bir yerdə olmaz; ən sadə: "other" bütün axınları aç
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_cash_flow_domain(date_from, date_to) + [('category', '=', 'other')]
-        return self._act_window('Digər Axınlar (Mədaxil/Məxaric)', 'volan.cash.flow', domain)
+        return self._act_window_other('Digər Axınlar (Mədaxil/Məxaric)')
+
+
+class BasketballCashBalance(models.TransientModel):
+    _name = 'basketball.cash.balance'
+    _inherit = 'volan.cash.dashboard'
+    _description = 'Basketbol Kassa Balansı'
+
+    _cash_sport_type = 'basketball'
+    _default_date_filter = 'month'
+    _payment_model = 'basketball.lesson.payment'
+    _lesson_model = 'basketball.lesson.simple'
+    _sale_model = 'basketball.product.sale'
+    _sale_state = 'confirmed'
+    _sale_date_field = 'sale_date'
+    _sale_amount_field = 'total_amount'
+    _sale_metric_prefix = 'uniform'
+
+    uniform_cash_amount = fields.Float('💵 Forma Nağd', readonly=True)
+    uniform_card_amount = fields.Float('💳 Forma Kart', readonly=True)
+    uniform_total_amount = fields.Float('💰 Forma Ümumi', readonly=True)
+    uniform_total_quantity = fields.Integer('🎽 Satılan Forma Sayı', readonly=True)
+
+    # Gecikmiş ödənişlər
+    delayed_payments_amount = fields.Float('⏰ Gecikmiş Ödənişlər', readonly=True,
+                                          help="Real_date bu tarix aralığında olmayan ama payment_date bu tarix aralığında olan ödənişlərin cəmi")
+
+    def _subscription_delayed_window(self, date_from, date_to):
+        """
+        - əgər interval eyni ay içindədirsə → payment_date həmin AY-da olmalıdır
+        - əgər interval bir neçə ayı əhatə edirsə → payment_date intervalda olmalıdır
+        """
+        same_month = (
+            date_from.year == date_to.year
+            and date_from.month == date_to.month
+        )
+        if same_month:
+            # Məs: 4–6 oktyabr → burada 1–31 oktyabr istifadə olunur
+            return super()._subscription_delayed_window(date_from, date_to)
+        # Məs: 1 sentyabr – 20 dekabr → bütün intervala baxırıq
+        return date_from, date_to
+
+    def _metric_sales(self, ctx):
+        metrics = super()._metric_sales(ctx)
+        quantity = 0.0
+        if ctx['date_from'] and ctx['date_to']:
+            # Satış sətirlərinin sayı - sətir cədvəlinə bir aqreqat sorğu
+            line_field = self.env[self._sale_model]._fields['sale_line_ids']
+            sale_domain = self._build_sale_domain(ctx['date_from'], ctx['date_to'])
+            line_domain = [(f'{line_field.inverse_name}.{name}', operator, value)
+                           for name, operator, value in sale_domain]
+            [(quantity,)] = self.env[line_field.comodel_name]._read_group(
+                line_domain, aggregates=['quantity:sum'])
+        metrics['uniform_total_quantity'] = int(quantity or 0)
+        return metrics
 
+    # ---------- Forma (basketball.product.sale) ----------
+    def action_view_uniform_cash(self):
+        return self._act_window_sales('Forma Satışları (Nağd)', 'cash')
+
+    def action_view_uniform_card(self):
+        return self._act_window_sales('Forma Satışları (Kart)', 'card')
+
+    def action_view_uniform_total(self):
+        return self._act_window_sales('Forma Satışları (Ümumi)')
 
 
 class BadmintonCashBalance(models.TransientModel):
     _name = 'badminton.cash.balance'
+    _inherit = 'volan.cash.dashboard'
     _description = 'Badminton Kassa Balansı'
 
-    date_filter = fields.Selection([
-        #('all', 'Bütün Tarixlər'),
-        #('today', 'Bu Gün'),
-        #('week', 'Bu Həftə'),
-        #('month', 'Bu Ay'),
-        #('year', 'Bu İl'),
-        ('custom', 'Özel Tarix')
-    ], string='📅 Tarix Filtri', default='custom', required=True)
-
-    date_from = fields.Date('📅 Başlanğıc Tarix', default=fields.Date.today)
-    date_to = fields.Date('📅 Bitmə Tarix', default=fields.Date.today)
-
-    subscription_cash_amount = fields.Float('💵 Abunəlik Nağd', readonly=True)
-    subscription_card_amount = fields.Float('💳 Abunəlik Kart', readonly=True)
-    subscription_total_amount = fields.Float('💰 Abunəlik Ümumi', readonly=True)
+    _cash_sport_type = 'badminton'
+    _metric_providers = ('subscription', 'sales', 'other', 'children', 'overall',
+                         'entries', 'payment_summary', 'cashbox')
+    _payment_model = 'badminton.lesson.payment'
+    _lesson_model = 'badminton.lesson.simple'
+    _sale_model = 'badminton.sale'
+    _sale_state = 'paid'
+    _sale_date_field = 'payment_date'
+    _sale_amount_field = 'amount_paid'
+    _sale_methods = ('cash', 'card', 'abonent')
+    _sale_metric_prefix = 'badminton_sale'
 
     badminton_sale_cash_amount = fields.Float('💵 Badminton Satışı Nağd', readonly=True)
     badminton_sale_card_amount = fields.Float('💳 Badminton Satışı Kart', readonly=True)
     badminton_sale_abonent_amount = fields.Float('🎫 Badminton Satışı Abunəçi', readonly=True)
     badminton_sale_total_amount = fields.Float('💰 Badminton Satışı Ümumi', readonly=True)
 
-    other_income_amount = fields.Float('💼 Mədaxil', readonly=True)
-    other_expense_amount = fields.Float('📉 Məxaric', readonly=True)
-    other_net_amount = fields.Float('🧾 Net Nəticə', readonly=True)
-
-    overall_cash_income = fields.Float('💵 Nağd Qalıq', readonly=True)
-    overall_card_income = fields.Float('💳 Kart Qalıq', readonly=True)
-    overall_total_income = fields.Float('💰 Ümumi Qalıq', readonly=True)
-    
-    cashbox_balance = fields.Float('🏦 Son Qalıq', readonly=True,
-                                   help='Bütün tarixlər üzrə Ümumi Qalıq')
-    initial_balance = fields.Float('🧾 İlkin Qalıq', readonly=True,
-                                   help='Kassa Balansı - seçilmiş tarix aralığındakı Ümumi Qalıq')
-
     total_children_count = fields.Integer('👥 Ümumi Müştəri', readonly=True)
     new_children_count = fields.Integer('🆕 Yeni Müştəri', readonly=True)
 
     delayed_payments_amount = fields.Float('⏰ Gecikmiş Ödənişlər', readonly=True,
                                           help="Real_date bu tarix aralığında olan amma payment_date başqa tarixdə olan ödənişlər")
 
-    # Gecikməyən ödənişlər (məlumat xarakterli)
-    ontime_payments_amount = fields.Float('✅ Aylıq net nəticə', readonly=True, compute='_compute_ontime_payments',
-                                         help="Abunəlik Ümumi - Gecikmiş Ödənişlər")
-
     cash_entries = fields.Integer('💵 Nağd Girişlər', readonly=True)
     card_entries = fields.Integer('💳 Card to Card Girişlər', readonly=True)
     abonent_entries = fields.Integer('🎫 Abunəçi Girişlər', readonly=True)
@@ -967,423 +1325,32 @@ class BadmintonCashBalance(models.TransientModel):
     abonent_payments = fields.Float('🎫 Abunəçi Ödənişləri', readonly=True)
     total_payments = fields.Float('💰 Ümumi Ödənişlər', readonly=True)
 
-    @api.model
-    def default_get(self, fields_list):
-        res = super().default_get(fields_list)
-        metrics = self._gather_metrics(override=res)
-        res.update(metrics)
-        return res
-    
-    @api.depends('subscription_total_amount', 'delayed_payments_amount')
-    def _compute_ontime_payments(self):
-        """Gecikməyən ödənişləri hesabla: Abunəlik Ümumi - Gecikmiş Ödənişlər"""
-        for record in self:
-            record.ontime_payments_amount = record.subscription_total_amount - record.delayed_payments_amount
-
-    def _resolve_filter_state(self, override=None):
-        if override:
-            date_filter = override.get('date_filter') or 'custom'
-            date_from = override.get('date_from')
-            date_to = override.get('date_to')
-        else:
-            date_filter = self.date_filter or 'custom'
-            date_from = self.date_from
-            date_to = self.date_to
-        return {
-            'date_filter': date_filter,
-            'date_from': date_from,
-            'date_to': date_to,
-        }
-
-    def _get_date_range(self, state):
-        today = fields.Date.today()
-        date_filter = state['date_filter']
-
-        if date_filter == 'all':
-            return (False, False)
-        if date_filter == 'today':
-            return (today, today)
-        if date_filter == 'week':
-            start = today - timedelta(days=today.weekday())
-            return (start, today)
-        if date_filter == 'month':
-            start = today.replace(day=1)
-            return (start, today)
-        if date_filter == 'year':
-            start = today.replace(month=1, day=1)
-            return (start, today)
-        if date_filter == 'custom':
-            if state['date_from'] and state['date_to']:
-                return (state['date_from'], state['date_to'])
-            return (False, False)
-        start = today.replace(day=1)
-        return (start, today)
-
-    def _empty_subscription_metrics(self):
-        return {
-            'subscription_cash_amount': 0.0,
-            'subscription_card_amount': 0.0,
-            'subscription_total_amount': 0.0,
-        }
-
-    def _empty_sale_metrics(self):
-        return {
-            'badminton_sale_cash_amount': 0.0,
-            'badminton_sale_card_amount': 0.0,
-            'badminton_sale_abonent_amount': 0.0,
-            'badminton_sale_total_amount': 0.0,
-        }
-
-    def _empty_other_metrics(self):
-        return {
-            'other_income_amount': 0.0,
-            'other_expense_amount': 0.0,
-            'other_net_amount': 0.0,
-        }
-
-    def _empty_overall_metrics(self):
-        return {
-            'overall_cash_income': 0.0,
-            'overall_card_income': 0.0,
-            'overall_total_income': 0.0,
-        }
-
-    def _empty_child_metrics(self):
-        return {
-            'total_children_count': 0,
-            'new_children_count': 0,
-        }
-
-    def _empty_entry_metrics(self):
-        return {
-            'cash_entries': 0,
-            'card_entries': 0,
-            'abonent_entries': 0,
-            'onefit_entries': 0,
-            'push30_entries': 0,
-            'push30_plus_entries': 0,
-            'tripsome_entries': 0,
-            'total_entries': 0,
-        }
-
-    def _get_subscription_payment_sets(self, date_from, date_to):
-        """Seçilmiş interval üçün 3 dəst qaytarır:
-        - timely: payment_date intervalda olanlar
-        - delayed: real_date intervalda, payment_date isə AY-dan kənar olanlar
-        - all_for_report: timely ∪ delayed  (reportda istifadə etdiyimiz)
-        """
-        payment_obj = self.env['badminton.lesson.payment']
-
-        if not date_from or not date_to:
-            empty = payment_obj.browse([])
-            return {
-                'timely': empty,
-                'delayed': empty,
-                'all_for_report': empty,
-            }
-
-        # 1️⃣ Intervalda payment_date
-        timely = payment_obj.search([
-            ('payment_date', '>=', date_from),
-            ('payment_date', '<=', date_to),
-        ])
-
-        # 2️⃣ Intervalda real_date
-        payments_real = payment_obj.search([
-            ('real_date', '>=', date_from),
-            ('real_date', '<=', date_to),
-            ('real_date', '!=', False),
-        ])
-
-        # 3️⃣ AY aralığını tap (date_from-un ayına görə)
-        month_start = date_from.replace(day=1)
-        month_end = month_start + relativedelta(months=1, days=-1)
-
-        # 4️⃣ Gecikmiş: real_date intervalda, payment_date AY-dan kənardadır
-        delayed = payments_real.filtered(lambda p:
-            not p.payment_date or
-            p.payment_date < month_start or
-            p.payment_date > month_end
-        )
-
-        # 5️⃣ Reportda istifadə etdiyimiz dəst:
-        # payment_date intervalda OLANLAR + gecikmişlər
-        all_for_report = timely | delayed
-
-        return {
-            'timely': timely,
-            'delayed': delayed,
-            'all_for_report': all_for_report,
-        }
-
-
-    def _compute_delayed_payments(self, override=None):
-        """
-        Gecikmiş ödənişləri hesabla:
-        real_date seçilmiş tarix intervalında,
-        payment_date isə həmin intervalın AYI üzrə deyil (başqa aydadır).
-        """
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return {'delayed_payments_amount': 0.0}
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return {'delayed_payments_amount': 0.0}
-
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        delayed_payments = sets['delayed']
-
-        delayed_amount = sum(delayed_payments.mapped('amount'))
-        return {'delayed_payments_amount': delayed_amount}
-
-
-    def _compute_subscription_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_subscription_metrics()
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return self._empty_subscription_metrics()
-
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        all_payments = sets['all_for_report']
-
-        cash_amount = sum(all_payments.filtered(
-            lambda p: p.payment_method_lesson == 'cash'
-        ).mapped('amount'))
-
-        card_amount = sum(all_payments.filtered(
-            lambda p: p.payment_method_lesson == 'card'
-        ).mapped('amount'))
-
-        total_amount = cash_amount + card_amount
+    def _metric_entries(self, ctx):
+        # Bir qruplaşdırılmış sayma: (payment_type, promo_type) -> say
+        counts = defaultdict(int)
+        if ctx['date_from'] and ctx['date_to']:
+            for payment_type, promo_type, count in self.env['badminton.session']._read_group(
+                self._sessions_domain(ctx['date_from'], ctx['date_to']),
+                groupby=['payment_type', 'promo_type'],
+                aggregates=['__count'],
+            ):
+                counts[('payment', payment_type)] += count
+                counts[('promo', promo_type)] += count
+                counts['total'] += count
 
         return {
-            'subscription_cash_amount': cash_amount,
-            'subscription_card_amount': card_amount,
-            'subscription_total_amount': total_amount,
-        }
-
-
-    def _build_sale_domain(self, date_from, date_to):
-        domain = [('state', '=', 'paid')]
-        if date_from and date_to:
-            start_dt = datetime.combine(date_from, datetime.min.time())
-            end_dt = datetime.combine(date_to, datetime.max.time())
-            domain += [
-                ('payment_date', '>=', start_dt),
-                ('payment_date', '<=', end_dt),
-            ]
-        return domain
-
-    def _compute_badminton_sale_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_sale_metrics()
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return self._empty_sale_metrics()
-
-        sale_obj = self.env['badminton.sale']
-        sales = sale_obj.search(self._build_sale_domain(date_from, date_to))
-
-        cash_amount = sum(sales.filtered(lambda s: s.payment_method == 'cash').mapped('amount_paid'))
-        card_amount = sum(sales.filtered(lambda s: s.payment_method == 'card').mapped('amount_paid'))
-        abonent_amount = sum(sales.filtered(lambda s: s.payment_method == 'abonent').mapped('amount_paid'))
-        total_amount = cash_amount + card_amount + abonent_amount
-
-        return {
-            'badminton_sale_cash_amount': cash_amount,
-            'badminton_sale_card_amount': card_amount,
-            'badminton_sale_abonent_amount': abonent_amount,
-            'badminton_sale_total_amount': total_amount,
-        }
-
-    def _build_cash_flow_domain(self, date_from, date_to):
-        domain = [('sport_type', '=', 'badminton')]
-        if date_from and date_to:
-            domain += [
-                ('date', '>=', date_from),
-                ('date', '<=', date_to),
-            ]
-        return domain
-
-    def _compute_other_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_other_metrics()
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return self._empty_other_metrics()
-
-        cash_flow_obj = self.env['volan.cash.flow']
-        base_domain = self._build_cash_flow_domain(date_from, date_to)
-
-        income_domain = base_domain + [
-            ('transaction_type', '=', 'income'),
-            ('category', '=', 'other'),
-        ]
-        expense_domain = base_domain + [
-            ('transaction_type', '=', 'expense'),
-            ('category', '=', 'other'),
-        ]
-
-        income_amount = sum(cash_flow_obj.search(income_domain).mapped('amount'))
-        expense_amount = sum(cash_flow_obj.search(expense_domain).mapped('amount'))
-        net_amount = income_amount - expense_amount
-
-        return {
-            'other_income_amount': income_amount,
-            'other_expense_amount': expense_amount,
-            'other_net_amount': net_amount,
-        }
-
-    def _compute_child_metrics(self, override=None):
-        lesson_obj = self.env['badminton.lesson.simple']
-        # Yalnız aktiv abunəlikləri say
-        all_lessons = lesson_obj.search([('state', '=', 'active')])
-        total_children = len(set(all_lessons.mapped('partner_id').ids))
-
-        state = self._resolve_filter_state(override)
-        date_from, date_to = self._get_date_range(state)
-
-        new_children = 0
-        if date_from and date_to:
-            lessons_in_range = lesson_obj.search([
-                ('payment_date', '>=', date_from),
-                ('payment_date', '<=', date_to),
-            ])
-            range_partners = set(lessons_in_range.mapped('partner_id').ids)
-            earlier_partners = set()
-            if date_from:
-                earlier_lessons = lesson_obj.search([('payment_date', '<', date_from)])
-                earlier_partners = set(earlier_lessons.mapped('partner_id').ids)
-            new_children = len(range_partners - earlier_partners)
-
-        return {
-            'total_children_count': total_children,
-            'new_children_count': new_children,
-        }
-
-    def _compute_entry_metrics(self, override=None):
-        state = self._resolve_filter_state(override)
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return self._empty_entry_metrics()
-
-        date_from, date_to = self._get_date_range(state)
-        if not date_from or not date_to:
-            return self._empty_entry_metrics()
-
-        session_obj = self.env['badminton.session']
-        session_domain = [('state', '=', 'completed')]
-        start_dt = datetime.combine(date_from, datetime.min.time())
-        end_dt = datetime.combine(date_to, datetime.max.time())
-        session_domain += [
-            ('start_time', '>=', start_dt),
-            ('start_time', '<=', end_dt),
-        ]
-        sessions = session_obj.search(session_domain)
-
-        cash_entries = len(sessions.filtered(lambda s: s.payment_type == 'cash'))
-        card_entries = len(sessions.filtered(lambda s: s.payment_type == 'card'))
-        abonent_entries = len(sessions.filtered(lambda s: s.payment_type == 'abonent'))
-        onefit_entries = len(sessions.filtered(lambda s: s.promo_type == '1fit'))
-        push30_entries = len(sessions.filtered(lambda s: s.promo_type == 'push30'))
-        push30_plus_entries = len(sessions.filtered(lambda s: s.promo_type == 'push30_plus'))
-        tripsome_entries = len(sessions.filtered(lambda s: s.promo_type == 'tripsome'))
-        total_entries = len(sessions)
-
-        return {
-            'cash_entries': cash_entries,
-            'card_entries': card_entries,
-            'abonent_entries': abonent_entries,
-            'onefit_entries': onefit_entries,
-            'push30_entries': push30_entries,
-            'push30_plus_entries': push30_plus_entries,
-            'tripsome_entries': tripsome_entries,
-            'total_entries': total_entries,
-        }
-
-    def _compute_overall_metrics(self, metrics):
-        cash_income = metrics.get('subscription_cash_amount', 0.0) + metrics.get('badminton_sale_cash_amount', 0.0)
-        card_income = metrics.get('subscription_card_amount', 0.0) + metrics.get('badminton_sale_card_amount', 0.0)
-        total_income = (cash_income + card_income +
-                        metrics.get('badminton_sale_abonent_amount', 0.0) +
-                        metrics.get('other_income_amount', 0.0)) - metrics.get('other_expense_amount', 0.0)
-
-        return {
-            'overall_cash_income': cash_income,
-            'overall_card_income': card_income,
-            'overall_total_income': total_income,
+            'cash_entries': counts[('payment', 'cash')],
+            'card_entries': counts[('payment', 'card')],
+            'abonent_entries': counts[('payment', 'abonent')],
+            'onefit_entries': counts[('promo', '1fit')],
+            'push30_entries': counts[('promo', 'push30')],
+            'push30_plus_entries': counts[('promo', 'push30_plus')],
+            'tripsome_entries': counts[('promo', 'tripsome')],
+            'total_entries': counts['total'],
         }
 
-    def _compute_all_time_overall_total(self, date_to):
-        """Ümumi Qalıq dəyərini 0-cı ildən seçilmiş tarix aralığının sonuna qədər hesablayır."""
-        payment_obj = self.env['badminton.lesson.payment']
-        
-        # payment_date və ya real_date seçilmiş tarix aralığının sonuna qədər olan ödənişlər
-        payment_date_payments = payment_obj.search([('payment_date', '<=', date_to)])
-        real_date_payments = payment_obj.search([
-            ('real_date', '<=', date_to),
-            ('real_date', '!=', False)
-        ])
-        all_payments = payment_date_payments | real_date_payments
-        
-        subscription_cash = sum(all_payments.filtered(lambda p: p.payment_method_lesson == 'cash').mapped('amount'))
-        subscription_card = sum(all_payments.filtered(lambda p: p.payment_method_lesson == 'card').mapped('amount'))
-
-        sale_obj = self.env['badminton.sale']
-        end_dt = datetime.combine(date_to, datetime.max.time())
-        sales = sale_obj.search([('state', '=', 'paid'), ('payment_date', '<=', end_dt)])
-        sale_cash = sum(sales.filtered(lambda s: s.payment_method == 'cash').mapped('amount_paid'))
-        sale_card = sum(sales.filtered(lambda s: s.payment_method == 'card').mapped('amount_paid'))
-        sale_abonent = sum(sales.filtered(lambda s: s.payment_method == 'abonent').mapped('amount_paid'))
-
-        cash_flow_obj = self.env['volan.cash.flow']
-        other_income = sum(cash_flow_obj.search([
-            ('sport_type', '=', 'badminton'),
-            ('category', '=', 'other'),
-            ('transaction_type', '=', 'income'),
-            ('date', '<=', date_to),
-        ]).mapped('amount'))
-        
-        # Xərcləri çıxırıq
-        other_expense = sum(cash_flow_obj.search([
-            ('sport_type', '=', 'badminton'),
-            ('transaction_type', '=', 'expense'),
-            ('date', '<=', date_to),
-        ]).mapped('amount'))
-
-        return (subscription_cash + subscription_card +
-                sale_cash + sale_card + sale_abonent + other_income - other_expense)
-
-    def _compute_cashbox_metrics(self, metrics, override=None):
-        state = self._resolve_filter_state(override)
-        date_from, date_to = self._get_date_range(state)
-        
-        if not date_to:
-            date_to = fields.Date.today()
-            
-        all_time_total = self._compute_all_time_overall_total(date_to)
-        
-        # İlkin Qalıq = seçilmiş intervaldan ƏVVƏL olan balans
-        if date_from:
-            date_before = date_from - timedelta(days=1)
-            initial_balance = self._compute_all_time_overall_total(date_before)
-        else:
-            initial_balance = 0.0
-        
-        return {
-            'cashbox_balance': all_time_total,
-            'initial_balance': initial_balance,
-            'overall_total_income': all_time_total,  # Ümumi Qalıq = Son Qalıq
-        }
-
-    def _compute_payment_summary(self, metrics):
+    def _metric_payment_summary(self, ctx):
+        metrics = ctx['metrics']
         cash_payments = metrics.get('subscription_cash_amount', 0.0) + metrics.get('badminton_sale_cash_amount', 0.0)
         card_payments = metrics.get('subscription_card_amount', 0.0) + metrics.get('badminton_sale_card_amount', 0.0)
         abonent_payments = metrics.get('badminton_sale_abonent_amount', 0.0)
@@ -1395,33 +1362,6 @@ class BadmintonCashBalance(models.TransientModel):
             'total_payments': total_payments,
         }
 
-    def _gather_metrics(self, override=None):
-        metrics = {}
-        metrics.update(self._compute_subscription_metrics(override=override))
-        metrics.update(self._compute_badminton_sale_metrics(override=override))
-        metrics.update(self._compute_other_metrics(override=override))
-        metrics.update(self._compute_child_metrics(override=override))
-        metrics.update(self._compute_delayed_payments(override=override))
-        metrics.update(self._compute_overall_metrics(metrics))
-        metrics.update(self._compute_entry_metrics(override=override))
-        metrics.update(self._compute_payment_summary(metrics))
-        metrics.update(self._compute_cashbox_metrics(metrics, override=override))
-        return metrics
-
-    def action_refresh(self):
-        metrics = self._gather_metrics()
-        self.write(metrics)
-        return {'type': 'ir.actions.client', 'tag': 'reload'}
-
-    @api.onchange('date_filter', 'date_from', 'date_to')
-    def _onchange_date_filter(self):
-        state = self._resolve_filter_state()
-        if state['date_filter'] == 'custom' and (not state['date_from'] or not state['date_to']):
-            return
-        metrics = self._gather_metrics()
-        for field_name, value in metrics.items():
-            setattr(self, field_name, value)
-
     def _open_badminton_cash_view(self, name, domain):
         self.ensure_one()
         state = self._resolve_filter_state()
@@ -1471,143 +1411,56 @@ class BadmintonCashBalance(models.TransientModel):
         ]
         return self._open_badminton_cash_view('Badminton Xərcləri', domain)
 
-    # ---------------- Helpers ----------------
-    def _ensure_one_and_get_range(self):
-        self.ensure_one()
-        state = self._resolve_filter_state()
-        date_from, date_to = self._get_date_range(state)
-        return date_from, date_to
-
-    def _act_window(self, name, res_model, domain, context=None):
-        ctx = dict(self.env.context)
-        if context:
-            ctx.update(context)
-        return {
-            "type": "ir.actions.act_window",
-            "name": name,
-            "res_model": res_model,
-            "view_mode": "list,form",
-            "views": [(False, "list"), (False, "form")],
-            "target": "current",
-            "domain": domain,
-            "context": ctx,
-        }
-
-    # ---------------- 1) Abunəlik (badminton.lesson.payment) ----------------
-    def action_view_subscription_cash(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets["all_for_report"].filtered(lambda p: p.payment_method_lesson == "cash")
-        return self._act_window("Abunəlik Nağd Ödənişləri", "badminton.lesson.payment", [("id", "in", payments.ids)])
-
-    def action_view_subscription_card(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets["all_for_report"].filtered(lambda p: p.payment_method_lesson == "card")
-        return self._act_window("Abunəlik Kart Ödənişləri", "badminton.lesson.payment", [("id", "in", payments.ids)])
-
-    def action_view_subscription_total(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets["all_for_report"]
-        return self._act_window("Abunəlik Ödənişləri (Ümumi)", "badminton.lesson.payment", [("id", "in", payments.ids)])
-
-    def action_view_delayed_payments(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sets = self._get_subscription_payment_sets(date_from, date_to)
-        payments = sets["delayed"]
-        return self._act_window("Gecikmiş Ödənişlər", "badminton.lesson.payment", [("id", "in", payments.ids)])
-
     # ---------------- 2) Badminton Satışı (badminton.sale) ----------------
     def action_view_badminton_sale_cash(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sales = self.env["badminton.sale"].search(self._build_sale_domain(date_from, date_to) + [("payment_method", "=", "cash")])
-        return self._act_window("Badminton Satışı (Nağd)", "badminton.sale", [("id", "in", sales.ids)])
+        return self._act_window_sales("Badminton Satışı (Nağd)", "cash")
 
     def action_view_badminton_sale_card(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sales = self.env["badminton.sale"].search(self._build_sale_domain(date_from, date_to) + [("payment_method", "=", "card")])
-        return self._act_window("Badminton Satışı (Kart)", "badminton.sale", [("id", "in", sales.ids)])
+        return self._act_window_sales("Badminton Satışı (Kart)", "card")
 
     def action_view_badminton_sale_abonent(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sales = self.env["badminton.sale"].search(self._build_sale_domain(date_from, date_to) + [("payment_method", "=", "abonent")])
-        return self._act_window("Badminton Satışı (Abunəçi)", "badminton.sale", [("id", "in", sales.ids)])
+        return self._act_window_sales("Badminton Satışı (Abunəçi)", "abonent")
 
     def action_view_badminton_sale_total(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sales = self.env["badminton.sale"].search(self._build_sale_domain(date_from, date_to))
-        return self._act_window("Badminton Satışı (Ümumi)", "badminton.sale", [("id", "in", sales.ids)])
-
-    # ---------------- 3) Digər Mədaxil/Məxaric (volan.cash.flow) ----------------
-    def action_view_other_income(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_cash_flow_domain(date_from, date_to) + [
-            ("transaction_type", "=", "income"),
-            ("category", "=", "other"),
-        ]
-        return self._act_window("Digər Mədaxil", "volan.cash.flow", domain, context={"default_sport_type": "badminton"})
-
-    def action_view_other_expense(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_cash_flow_domain(date_from, date_to) + [
-            ("transaction_type", "=", "expense"),
-            ("category", "=", "other"),
-        ]
-        return self._act_window("Digər Məxaric", "volan.cash.flow", domain, context={"default_sport_type": "badminton"})
-
-    def action_view_other_net(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        domain = self._build_cash_flow_domain(date_from, date_to) + [("category", "=", "other")]
-        return self._act_window("Digər Axınlar (Net detalları)", "volan.cash.flow", domain, context={"default_sport_type": "badminton"})
+        return self._act_window_sales("Badminton Satışı (Ümumi)")
 
     # ---------------- 4) Giriş Hesabatı (badminton.session) ----------------
-    def _sessions_in_range(self, date_from, date_to):
+    def _sessions_domain(self, date_from, date_to):
+        """Tamamlanmış sessiyalar domain-i - həm metrik sayğacı, həm drill-down-lar istifadə edir"""
         start_dt = datetime.combine(date_from, datetime.min.time())
         end_dt = datetime.combine(date_to, datetime.max.time())
-        return self.env["badminton.session"].search([
+        return [
             ("state", "=", "completed"),
             ("start_time", ">=", start_dt),
             ("start_time", "<=", end_dt),
-        ])
+        ]
 
-    def action_view_entries_cash(self):
+    def _act_window_sessions(self, title, extra_domain=None):
         date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.payment_type == "cash")
-        return self._act_window("Girişlər (Nağd)", "badminton.session", [("id", "in", sessions.ids)])
+        domain = self._sessions_domain(date_from, date_to) + (extra_domain or [])
+        return self._act_window(title, "badminton.session", domain)
+
+    def action_view_entries_cash(self):
+        return self._act_window_sessions("Girişlər (Nağd)", [("payment_type", "=", "cash")])
 
     def action_view_entries_card(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.payment_type == "card")
-        return self._act_window("Girişlər (Card to card)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Girişlər (Card to card)", [("payment_type", "=", "card")])
 
     def action_view_entries_abonent(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.payment_type == "abonent")
-        return self._act_window("Girişlər (Abunəçi)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Girişlər (Abunəçi)", [("payment_type", "=", "abonent")])
 
     # ---------------- 5) Tətbiq Hesabatı (badminton.session promo_type) ----------------
     def action_view_app_onefit(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.promo_type == "1fit")
-        return self._act_window("Tətbiq Girişləri (1FIT)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Tətbiq Girişləri (1FIT)", [("promo_type", "=", "1fit")])
 
     def action_view_app_push30(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.promo_type == "push30")
-        return self._act_window("Tətbiq Girişləri (PUSH30)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Tətbiq Girişləri (PUSH30)", [("promo_type", "=", "push30")])
 
     def action_view_app_push30_plus(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.promo_type == "push30_plus")
-        return self._act_window("Tətbiq Girişləri (PUSH30+)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Tətbiq Girişləri (PUSH30+)", [("promo_type", "=", "push30_plus")])
 
     def action_view_app_tripsome(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to).filtered(lambda s: s.promo_type == "tripsome")
-        return self._act_window("Tətbiq Girişləri (Tripsome)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Tətbiq Girişləri (Tripsome)", [("promo_type", "=", "tripsome")])
 
     def action_view_entries_total(self):
-        date_from, date_to = self._ensure_one_and_get_range()
-        sessions = self._sessions_in_range(date_from, date_to)
-        return self._act_window("Girişlər (Ümumi)", "badminton.session", [("id", "in", sessions.ids)])
+        return self._act_window_sessions("Girişlər (Ümumi)")
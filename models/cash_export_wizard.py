@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+from collections import defaultdict
+from datetime import date, datetime
+import csv
+import os
+import tempfile
+import uuid
+
+EXPORT_MODEL_SELECTION = [
+    ('volan.cash.flow', 'Kassa Axını'),
+    ('badminton.lesson.payment', 'Badminton Dərs Ödənişləri'),
+    ('basketball.lesson.payment', 'Basketbol Dərs Ödənişləri'),
+]
+
+
+class CashExportWizard(models.TransientModel):
+    """Kassa axını və dərs ödənişlərinin CSV/XLSX ixracı.
+
+    Standart list ixracından fərqli olaraq qeydlər yaddaşa yüklənmir: sətirlər server-side
+    cursor ilə hissə-hissə oxunur, adlar hər hissə üçün bir sorğu ilə tapılır və fayl
+    müvəqqəti diskə yazılır (controllers/cash_export.py onu axınla göndərir).
+    """
+    _name = 'volan.cash.export.wizard'
+    _description = 'Kassa İxrac Sihirbazı'
+
+    _EXPORT_CHUNK = 2000
+    # list görünüşünün "hamısını seç" zamanı active_ids-i kəsdiyi hədd (web.active_ids_limit)
+    _DEFAULT_ACTIVE_IDS_LIMIT = 20000
+    # model -> (tarix sahəsi, sütunlar); 'source' kassa axınının mənbə sənədidir
+    _EXPORT_COLUMNS = {
+        'volan.cash.flow': ('date', ['date', 'name', 'sport_type', 'category', 'transaction_type',
+                                     'partner_id', 'amount', 'notes', 'source']),
+        'badminton.lesson.payment': ('real_date', ['real_date', 'payment_date', 'lesson_id', 'partner_id',
+                                                   'payment_method_lesson', 'amount', 'notes']),
+        'basketball.lesson.payment': ('real_date', ['real_date', 'payment_date', 'lesson_id', 'partner_id',
+                                                    'payment_method_lesson', 'amount', 'notes']),
+    }
+
+    res_model = fields.Selection(EXPORT_MODEL_SELECTION, string="Məlumat", required=True,
+                                 default=lambda self: self._default_res_model())
+    file_format = fields.Selection([
+        ('xlsx', 'Excel (XLSX)'),
+        ('csv', 'CSV'),
+    ], string="Format", required=True, default='xlsx')
+    date_from = fields.Date(string="Başlanğıc Tarix")
+    date_to = fields.Date(string="Bitmə Tarix")
+    # Seçimin gəldiyi model: seçilmiş id/domain yalnız bu model üçün keçərlidir
+    record_model = fields.Char(string="Seçim Modeli",
+                               default=lambda self: self._default_record_model())
+    record_ids = fields.Json(string="Seçilmiş Qeydlər",
+                             default=lambda self: self._default_record_ids())
+    # "Hamısını seç" zamanı active_ids hədd qədər kəsilir, tam seçim active_domain-dədir
+    record_domain = fields.Json(string="Seçim Domeni",
+                                default=lambda self: self._default_record_domain())
+    only_selected = fields.Boolean(string="Yalnız seçilmiş qeydlər",
+                                   default=lambda self: bool(self._default_record_ids()
+                                                             or self._default_record_domain()))
+
+    @api.model
+    def _default_res_model(self):
+        active_model = self.env.context.get('active_model')
+        if active_model in self._EXPORT_COLUMNS:
+            return active_model
+        return 'volan.cash.flow'
+
+    @api.model
+    def _default_record_model(self):
+        active_model = self.env.context.get('active_model')
+        if active_model in self._EXPORT_COLUMNS and self.env.context.get('active_ids'):
+            return active_model
+        return False
+
+    @api.model
+    def _default_record_ids(self):
+        if self.env.context.get('active_model') in self._EXPORT_COLUMNS:
+            return self.env.context.get('active_ids') or []
+        return []
+
+    @api.model
+    def _default_record_domain(self):
+        """Yalnız həqiqi "hamısını seç" üçün: list görünüşü active_domain-i həmişə (bir neçə
+        sətir seçiləndə də) göndərir, ona görə domain active_ids hədd qədər kəsiləndə götürülür.
+        """
+        active_ids = self._default_record_ids()
+        if not active_ids:
+            return []
+        limit = int(self.env['ir.config_parameter'].sudo().get_param(
+            'web.active_ids_limit', default=self._DEFAULT_ACTIVE_IDS_LIMIT))
+        if len(active_ids) < limit:
+            return []
+        return self.env.context.get('active_domain') or []
+
+    def action_export(self):
+        self.ensure_one()
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise UserError("Başlanğıc tarix bitmə tarixindən böyük ola bilməz!")
+        if self.only_selected and self.record_model and self.record_model != self.res_model:
+            raise UserError("Seçilmiş qeydlər başqa məlumat növünə aiddir! "
+                            "Bütün qeydləri ixrac etmək üçün \"Yalnız seçilmiş qeydlər\" seçimini söndürün.")
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/volan_yasamal/cash_export/{self.id}',
+            'target': 'self',
+        }
+
+    # ---------- ixrac ----------
+    def _get_export_domain(self):
+        date_field, _columns = self._EXPORT_COLUMNS[self.res_model]
+        domain = []
+        if self.only_selected and self.record_model and self.record_model != self.res_model:
+            raise UserError("Seçilmiş qeydlər başqa məlumat növünə aiddir!")
+        if self.only_selected and self.record_domain:
+            domain = list(self.record_domain)
+        elif self.only_selected and self.record_ids:
+            domain.append(('id', 'in', self.record_ids))
+        if self.date_from:
+            domain.append((date_field, '>=', self.date_from))
+        if self.date_to:
+            domain.append((date_field, '<=', self.date_to))
+        return domain
+
+    def _iter_chunks(self):
+        """Sətirləri server-side (adlandırılmış) cursor ilə _EXPORT_CHUNK ölçülü hissələrlə qaytar"""
+        model = self.env[self.res_model]
+        date_field, columns = self._EXPORT_COLUMNS[self.res_model]
+        sql_columns = ['related_model', 'related_id'] if 'source' in columns else []
+        sql_columns += [name for name in columns if name != 'source']
+
+        model.flush_model(sql_columns)
+        query = model._search(self._get_export_domain())
+        query.order = SQL('%s DESC, %s DESC', SQL.identifier(model._table, date_field), SQL.identifier(model._table, 'id'))
+        select = query.select(*[SQL.identifier(model._table, name) for name in sql_columns])
+
+        cursor = self.env.cr._cnx.cursor(f'volan_cash_export_{uuid.uuid4().hex}')
+        try:
+            cursor.itersize = self._EXPORT_CHUNK
+            cursor.execute(select.code, select.params)
+            while True:
+                rows = cursor.fetchmany(self._EXPORT_CHUNK)
+                if not rows:
+                    break
+                yield [dict(zip(sql_columns, row)) for row in rows]
+        finally:
+            cursor.close()
+
+    def _resolve_names(self, comodel_name, ids):
+        """{id: display_name} - bir hissə üçün bir sorğu.
+
+        Adlar sudo ilə oxunur: ixrac olunan sətir görünürsə, onun əlaqəli qeydinin adı da
+        yazılmalıdır (record rule ixracın ortasında AccessError verməsin).
+        """
+        if not ids:
+            return {}
+        records = self.env[comodel_name].sudo().browse(list(ids)).exists()
+        return {record['id']: record['display_name'] for record in records.read(['display_name'])}
+
+    def _resolve_sources(self, rows):
+        """Kassa axınlarının mənbə sənəd adları - model üzrə qruplaşdırılmış bir sorğu"""
+        ids_by_model = defaultdict(set)
+        for row in rows:
+            if row['related_model'] and row['related_id']:
+                ids_by_model[row['related_model']].add(row['related_id'])
+        names = {}
+        for model_name, source_ids in ids_by_model.items():
+            if model_name not in self.env:
+                continue
+            for source_id, name in self._resolve_names(model_name, source_ids).items():
+                names[(model_name, source_id)] = name
+        return names
+
+    def _export_rows(self):
+        """Başlıq və sonra formatlanmış sətirlər (hər hissədən sonra ORM keşi təmizlənir)"""
+        model = self.env[self.res_model]
+        _date_field, columns = self._EXPORT_COLUMNS[self.res_model]
+        yield [model._fields[name].string if name != 'source' else 'Mənbə' for name in columns]
+
+        selections = {
+            name: dict(model._fields[name]._description_selection(self.env))
+            for name in columns if name != 'source' and model._fields[name].type == 'selection'
+        }
+        many2ones = [name for name in columns if name != 'source' and model._fields[name].type == 'many2one']
+
+        for rows in self._iter_chunks():
+            names = {
+                name: self._resolve_names(model._fields[name].comodel_name,
+                                          {row[name] for row in rows if row[name]})
+                for name in many2ones
+            }
+            sources = self._resolve_sources(rows) if 'source' in columns else {}
+            for row in rows:
+                values = []
+                for name in columns:
+                    if name == 'source':
+                        value = sources.get((row['related_model'], row['related_id']), '')
+                    elif name in selections:
+                        value = selections[name].get(row[name], row[name] or '')
+                    elif name in names:
+                        value = names[name].get(row[name], '')
+                    elif isinstance(row[name], datetime):
+                        value = fields.Datetime.to_string(row[name])
+                    elif isinstance(row[name], date):
+                        value = fields.Date.to_string(row[name])
+                    else:
+                        value = row[name] if row[name] is not None else ''
+                    values.append(value)
+                yield values
+            self.env.invalidate_all()
+
+    def _export_to_file(self):
+        """Faylı müvəqqəti diskə yaz; (yol, fayl adı, mimetype) qaytarır"""
+        self.ensure_one()
+        self.env[self.res_model].check_access_rights('read')
+        base_name = f"{self.res_model.replace('.', '_')}_{fields.Date.to_string(fields.Date.context_today(self))}"
+        handle, path = tempfile.mkstemp(suffix=f'.{self.file_format}', prefix='volan_cash_export_')
+        os.close(handle)
+        try:
+            if self.file_format == 'csv':
+                with open(path, 'w', encoding='utf-8-sig', newline='') as stream:
+                    writer = csv.writer(stream)
+                    for values in self._export_rows():
+                        writer.writerow(values)
+                return path, f'{base_name}.csv', 'text/csv'
+
+            import xlsxwriter
+            # constant_memory: hər sətir yazılan kimi diskə düşür
+            workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+            worksheet = workbook.add_worksheet()
+            for row_index, values in enumerate(self._export_rows()):
+                worksheet.write_row(row_index, 0, values)
+            workbook.close()
+            return path, f'{base_name}.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        except Exception:
+            os.unlink(path)
+            raise
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from collections import OrderedDict
+import threading
+import time
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Proses daxilində bütün worker thread-ləri üçün ortaq keş:
+# (db, model, date_filter, date_from, date_to) -> (data_version, saxlanma vaxtı, metrics)
+_METRICS_CACHE = OrderedDict()
+_METRICS_CACHE_LOCK = threading.Lock()
+
+
+class CashMetricsCache(models.AbstractModel):
+    """Kassa dashboard-larının _gather_metrics nəticələri üçün ölçüsü və TTL-i məhdud keş.
+
+    Keş açarına "data version" də daxildir. Bu versiya ödəniş, satış, kassa axını,
+    abunəlik və sessiya dəyişəndə artırılan PostgreSQL sequence-dir,
+    buna görə dəyişiklik olmadıqca bütün reception kompüterləri eyni nəticəni oxuyur.
+    """
+    _name = 'volan.cash.metrics.cache'
+    _description = 'Kassa Metrikləri Keşi'
+
+    _VERSION_SEQUENCE = 'volan_cash_data_version_seq'
+    _DEFAULT_MAX_ENTRIES = 256
+    _DEFAULT_TTL = 300  # saniyə
+
+    def init(self):
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {self._VERSION_SEQUENCE}")
+
+    # ---------- data version ----------
+    @api.model
+    def _get_data_version(self):
+        self.env.cr.execute(f"SELECT last_value, is_called FROM {self._VERSION_SEQUENCE}")
+        last_value, is_called = self.env.cr.fetchone()
+        return last_value if is_called else 0
+
+    @api.model
+    def _bump_data_version(self):
+        """Məlumat dəyişdi: keşdəki bütün nəticələri köhnəlmiş et.
+
+        Sequence tranzaksiyadan asılı deyil, ona görə commit-dən sonra da bir dəfə artırılır ki,
+        commit olunmamış məlumatla hesablanmış nəticə yeni versiya ilə keşdə qalmasın.
+        """
+        self.env.cr.execute("SELECT nextval(%s)", (self._VERSION_SEQUENCE,))
+        if not self.env.cr.postcommit.data.get('volan_cash_version_bump'):
+            self.env.cr.postcommit.data['volan_cash_version_bump'] = True
+            dbname = self.env.cr.dbname
+            registry = self.env.registry
+
+            def bump_after_commit():
+                try:
+                    with registry.cursor() as cr:
+                        cr.execute("SELECT nextval(%s)", (self._VERSION_SEQUENCE,))
+                except Exception:
+                    _logger.exception("Kassa data version artırıla bilmədi (db=%s)", dbname)
+
+            self.env.cr.postcommit.add(bump_after_commit)
+
+    # ---------- settings ----------
+    @api.model
+    def _get_settings(self):
+        params = self.env['ir.config_parameter'].sudo()
+        ttl = int(params.get_param('volan_yasamal.cash_metrics_cache_ttl', self._DEFAULT_TTL))
+        max_entries = int(params.get_param('volan_yasamal.cash_metrics_cache_size', self._DEFAULT_MAX_ENTRIES))
+        return ttl, max_entries
+
+    # ---------- cache ----------
+    @api.model
+    def _make_key(self, model_name, date_filter, date_from, date_to):
+        return (self.env.cr.dbname, model_name, date_filter, date_from, date_to)
+
+    @api.model
+    def _get(self, key):
+        """Keşdə etibarlı nəticə varsa onun surətini, yoxdursa None qaytarır"""
+        ttl, _max_entries = self._get_settings()
+        if ttl <= 0:
+            return None
+        version = self._get_data_version()
+        with _METRICS_CACHE_LOCK:
+            entry = _METRICS_CACHE.get(key)
+            if not entry:
+                return None
+            entry_version, stored_at, metrics = entry
+            if entry_version != version or time.monotonic() - stored_at > ttl:
+                del _METRICS_CACHE[key]
+                return None
+            _METRICS_CACHE.move_to_end(key)
+            return dict(metrics)
+
+    @api.model
+    def _set(self, key, metrics, version):
+        ttl, max_entries = self._get_settings()
+        if ttl <= 0 or max_entries <= 0:
+            return
+        with _METRICS_CACHE_LOCK:
+            _METRICS_CACHE[key] = (version, time.monotonic(), dict(metrics))
+            _METRICS_CACHE.move_to_end(key)
+            while len(_METRICS_CACHE) > max_entries:
+                _METRICS_CACHE.popitem(last=False)
+
+    @api.model
+    def get_or_compute(self, key, compute, force=False):
+        """Keşdən oxu və ya compute() ilə hesablayıb saxla. force=True keşi keçir."""
+        if not force:
+            cached = self._get(key)
+            if cached is not None:
+                return cached
+        # Versiya hesablamadan ƏVVƏL oxunur: hesablama zamanı dəyişiklik olsa, nəticə köhnə versiya ilə saxlanır
+        version = self._get_data_version()
+        metrics = compute()
+        self._set(key, metrics, version)
+        return metrics
+
+    @api.model
+    def clear(self):
+        with _METRICS_CACHE_LOCK:
+            _METRICS_CACHE.clear()
+        return True
+
+
+class CashDashboardSnapshot(models.Model):
+    """Kassa dashboard-larının arxa fonda hesablanmış son nəticəsi (bütün worker-lər üçün ortaq).
+
+    Uzun intervallı yeniləmə HTTP worker-i bloklamasın deyə: düymə son snapshot-u dərhal göstərir,
+    hesablamanı cron-a (ir.cron._trigger) növbəyə qoyur, nəticə hazır olanda bus ilə forma göndərilir.
+    """
+    _name = 'volan.cash.dashboard.snapshot'
+    _description = 'Kassa Dashboard Snapshot'
+    _order = 'computed_at desc, id desc'
+
+    dashboard_model = fields.Char('Dashboard Modeli', required=True, index=True)
+    date_filter = fields.Char('Tarix Filtri', required=True)
+    date_from = fields.Date('Başlanğıc Tarix')
+    date_to = fields.Date('Bitmə Tarix')
+    metrics = fields.Json('Metriklər', readonly=True)
+    computed_at = fields.Datetime('Hesablanma Vaxtı', readonly=True)
+    state = fields.Selection([
+        ('pending', 'Növbədə'),
+        ('running', 'Hesablanır'),
+        ('done', 'Hazır'),
+        ('failed', 'Xəta'),
+    ], string='Vəziyyət', default='done', required=True, index=True)
+    requested_uid = fields.Many2one('res.users', string='Tələb Edən', readonly=True)
+    dashboard_res_id = fields.Integer('Dashboard Qeydi', readonly=True)
+
+    @api.model
+    def _find(self, dashboard_model, date_filter, date_from, date_to):
+        return self.sudo().search([
+            ('dashboard_model', '=', dashboard_model),
+            ('date_filter', '=', date_filter),
+            ('date_from', '=', date_from or False),
+            ('date_to', '=', date_to or False),
+        ], limit=1)
+
+    @api.model
+    def _enqueue(self, dashboard, date_filter, date_from, date_to):
+        """Hesablamanı növbəyə qoy və cron-u dərhal işə sal. Mövcud snapshot-u qaytarır."""
+        snapshot = self._find(dashboard._name, date_filter, date_from, date_to)
+        vals = {
+            'state': 'pending',
+            'requested_uid': self.env.uid,
+            'dashboard_res_id': dashboard.id,
+        }
+        if snapshot:
+            snapshot.write(vals)
+        else:
+            snapshot = self.sudo().create(dict(vals,
+                dashboard_model=dashboard._name,
+                date_filter=date_filter,
+                date_from=date_from or False,
+                date_to=date_to or False,
+            ))
+        self.env.ref('volan_yasamal.ir_cron_cash_dashboard_snapshot').sudo()._trigger()
+        return snapshot
+
+    @api.model
+    def _cron_process_pending(self, limit=10):
+        """Növbədəki snapshot-ları hesabla, dashboard qeydinə yaz və tələb edənə bus ilə bildir"""
+        snapshots = self.sudo().search([('state', '=', 'pending')], order='write_date', limit=limit)
+        for snapshot in snapshots:
+            snapshot.state = 'running'
+            self.env.cr.commit()
+            try:
+                snapshot._compute_snapshot()
+                self.env.cr.commit()
+            except Exception:
+                self.env.cr.rollback()
+                _logger.exception("Kassa snapshot hesablanmadı (id=%s)", snapshot.id)
+                snapshot._mark_failed()
+                self.env.cr.commit()
+
+    def _mark_failed(self):
+        """Hesablama alınmadı: forma gözləməsin, tələb edənə xəta bildirişi göndər"""
+        self.ensure_one()
+        self.state = 'failed'
+        user = self.requested_uid or self.env.user
+        dashboard = self.env[self.dashboard_model].sudo().browse(self.dashboard_res_id).exists()
+        if dashboard:
+            dashboard.refresh_pending = False
+        self.env['bus.bus']._sendone(user.partner_id, 'volan_cash_dashboard/updated', {
+            'model': self.dashboard_model,
+            'res_id': self.dashboard_res_id,
+            'computed_at': fields.Datetime.to_string(self.computed_at) if self.computed_at else False,
+            'error': True,
+        })
+
+    def _compute_snapshot(self):
+        self.ensure_one()
+        user = self.requested_uid or self.env.user
+        dashboard_obj = self.env[self.dashboard_model].with_user(user)
+        override = {
+            'date_filter': self.date_filter,
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+        }
+        metrics = dashboard_obj._gather_metrics(override=override, force=True)
+        computed_at = fields.Datetime.now()
+        self.write({'metrics': metrics, 'computed_at': computed_at, 'state': 'done'})
+
+        dashboard = dashboard_obj.browse(self.dashboard_res_id).exists()
+        if dashboard:
+            dashboard.write(dict(metrics, snapshot_computed_at=computed_at, refresh_pending=False))
+        self.env['bus.bus']._sendone(user.partner_id, 'volan_cash_dashboard/updated', {
+            'model': self.dashboard_model,
+            'res_id': self.dashboard_res_id,
+            'computed_at': fields.Datetime.to_string(computed_at),
+        })
@@ -12,6 +12,11 @@ class CustomerLookupWizard(models.TransientModel):
     @api.onchange('search_term')
     def _onchange_search_term(self):
         if self.search_term and len(self.search_term) >= 2:
+            # Oxunmuş QR kod: token indeksi ilə birbaşa tap
+            partner = self.env['res.partner']._resolve_qr_payload(self.search_term)
+            if partner:
+                self.customer_ids = [(6, 0, partner.ids)]
+                return
             domain = [
                 '|', '|',
                 ('name', 'ilike', self.search_term),
@@ -36,16 +36,13 @@ class QRScannerWizard(models.TransientModel):
         """Badminton sessiyası üçün QR kod oxuma"""
         try:
             qr_data = self.qr_code_input.strip()
-            if "ID-" in qr_data and "NAME-" in qr_data:
-                partner_id_str = qr_data.split("ID-")[1].split("-")[0]
-                partner_name = qr_data.split("NAME-")[1]
-                partner_id = int(partner_id_str)
-                
-                partner = self.env['res.partner'].browse(partner_id)
-                
-                if not partner.exists():
-                    self.result_message = f"❌ Xəta: ID={partner_id} olan müştəri tapılmadı!\nQR Kod: {qr_data}"
+            # URL (pid + token), yalnız token və köhnə 'ID-..-NAME-' formatları
+            partner = self.env['res.partner']._resolve_qr_payload(qr_data)
+            if partner is not None:
+                if not partner:
+                    self.result_message = f"❌ Xəta: QR koda uyğun müştəri tapılmadı!\nQR Kod: {qr_data}"
                     return self._return_wizard()
+                partner_id = partner.id
                 
                 # Müştəri məlumatını set et
                 self.partner_id = partner
@@ -91,19 +88,21 @@ class QRScannerWizard(models.TransientModel):
                     'duration_hours': 1.0,
                 })
 
+                occupancy = self.env['badminton.court.occupancy'].sudo().get_occupancy()
                 self.result_message = (
                     "✅ SESSİYA YARADILDI (Gözləmədə)!\n"
                     f"👤 Müştəri: {partner.name}\n"
                     f"💡 Aylıq balans: {monthly_hours} saat\n"
                     f"💰 Normal balans: {normal_balance} saat\n"
-                    f"🔢 Növbə: {session.queue_number}"
+                    f"🔢 Növbə: {session.queue_number}\n"
+                    f"🏸 Zal: {occupancy['active']}/{occupancy['capacity']}"
                 )
                 self.session_id = session.id
                 
                 return self._return_wizard()
                 
             else:
-                self.result_message = f"❌ QR kod formatı səhvdir!\n\nOxunan kod: '{qr_data}'\n\nDüzgün format: 'ID-123-NAME-Ad Soyad'"
+                self.result_message = f"❌ QR kod formatı səhvdir!\n\nOxunan kod: '{qr_data}'\n\nDüzgün format: müştəri QR kodu (link) və ya 'ID-123-NAME-Ad Soyad'"
                 return self._return_wizard()
                 
         except Exception as e:
@@ -213,16 +212,12 @@ class QRScannerWizard(models.TransientModel):
         try:
             qr_data = self.qr_code_input.strip()
 
-            if "ID-" in qr_data and "NAME-" in qr_data:
-                partner_id_str = qr_data.split("ID-")[1].split("-")[0]
-                partner_name = qr_data.split("NAME-")[1]
-                partner_id = int(partner_id_str)
-                
-                partner = self.env['res.partner'].browse(partner_id)
-                
-                if not partner.exists():
-                    self.result_message = f"❌ Xəta: ID={partner_id} olan müştəri tapılmadı!"
+            partner = self.env['res.partner']._resolve_qr_payload(qr_data)
+            if partner is not None:
+                if not partner:
+                    self.result_message = "❌ Xəta: QR koda uyğun müştəri tapılmadı!"
                     return self._return_wizard()
+                partner_id = partner.id
                 
                 # Müştəri məlumatını set et
                 self.partner_id = partner
@@ -372,7 +367,7 @@ class QRScannerWizard(models.TransientModel):
                 return self._return_wizard()
                 
             else:
-                self.result_message = f"❌ QR kod formatı səhvdir!\nOxunan kod: '{qr_data}'\nDüzgün format: 'ID-123-NAME-Ad Soyad'"
+                self.result_message = f"❌ QR kod formatı səhvdir!\nOxunan kod: '{qr_data}'\nDüzgün format: müştəri QR kodu (link) və ya 'ID-123-NAME-Ad Soyad'"
                 return self._return_wizard()
                 
         except Exception as e:
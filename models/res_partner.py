@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
+from urllib.parse import urlparse, parse_qs
 import qrcode
 import base64
 import io
+import logging
+import re
+
+_logger = logging.getLogger(__name__)
+
+# Köhnə QR formatları: 'ID-123-NAME-Ad Soyad' və 'ID:123-NAME:Ad Soyad'
+LEGACY_QR_PATTERN = re.compile(r'^ID[-:](\d+)-NAME[-:]')
 
 class VolanPartner(models.Model):
     _inherit = 'res.partner'
@@ -84,6 +92,105 @@ class VolanPartner(models.Model):
     # 7. Məşqçi bayrağı
     is_coach = fields.Boolean(string="Məşqçidir", default=False, help="İşçinin məşqçi olub olmadığını göstərir")
 
+    def init(self):
+        # QR token ilə O(1) axtarış (turniket / resepsiya scan-ları)
+        self.env.cr.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'res_partner_qr_token_uniq_idx'")
+        if self.env.cr.fetchone():
+            return
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    CREATE UNIQUE INDEX res_partner_qr_token_uniq_idx ON res_partner (qr_token)
+                     WHERE qr_token IS NOT NULL AND qr_token != ''
+                """)
+        except Exception:
+            _logger.error("res_partner.qr_token unikal deyil, unikal indeks yaradıla bilmədi; "
+                          "adi indeks istifadə olunur. Təkrarlanan tokenləri düzəldin.")
+            tools.create_index(self.env.cr, 'res_partner_qr_token_idx', 'res_partner', ['qr_token'])
+
+    def write(self, vals):
+        # QR keşində yalnız tapılan tokenlər saxlanılır: köhnə token dəyişəndə və ya tokenli
+        # müştəri arxivlənəndə keş köhnəlir (yeni token / aktivləşdirmə keşə təsir etmir)
+        stale = False
+        if 'qr_token' in vals:
+            stale = any(partner.qr_token and partner.qr_token != vals['qr_token'] for partner in self)
+        if 'active' in vals and not vals['active']:
+            stale = stale or any(self.mapped('qr_token'))
+        res = super().write(vals)
+        if stale:
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        stale = any(self.mapped('qr_token'))
+        res = super().unlink()
+        if stale:
+            self.env.registry.clear_cache()
+        return res
+
+    # ---------- QR scan ----------
+    @api.model
+    def _parse_qr_payload(self, payload):
+        """QR məzmununu (partner_id, token) cütünə çevir; format tanınmasa (None, None).
+
+        Dəstəklənən formatlar:
+        - URL: https://.../qr/genclik?pid=123&t=TOKEN (res.partner._compute_qr_code)
+        - yalnız token
+        - köhnə: 'ID-123-NAME-Ad Soyad' və 'ID:123-NAME:Ad Soyad' (token yoxdur)
+        """
+        payload = (payload or '').strip()
+        if not payload:
+            return None, None
+        if '?' in payload or payload.startswith(('http://', 'https://')):
+            params = parse_qs(urlparse(payload).query)
+            partner_id = (params.get('pid') or [''])[0]
+            token = (params.get('t') or [''])[0]
+            if not token:
+                return None, None
+            return (int(partner_id) if partner_id.isdigit() else None), token
+        legacy = LEGACY_QR_PATTERN.match(payload)
+        if legacy:
+            return int(legacy.group(1)), None
+        if re.fullmatch(r'[\w-]{8,}', payload):
+            return None, payload
+        return None, None
+
+    @api.model
+    @tools.ormcache('token')
+    def _get_partner_id_by_qr_token(self, token):
+        """Token -> partner id (unikal indeks; nəticə LRU ormcache-də saxlanılır).
+
+        Tapılmayan token keşlənmir (istisna atılır), token dəyişəndə keş təmizlənir.
+        """
+        self.flush_model(['qr_token', 'active'])
+        self.env.cr.execute("SELECT id FROM res_partner WHERE qr_token = %s AND active", (token,))
+        row = self.env.cr.fetchone()
+        if not row:
+            raise KeyError(token)
+        return row[0]
+
+    @api.model
+    def _resolve_qr_payload(self, payload):
+        """Bütün scan yolları üçün vahid resolver.
+
+        Format tanınmasa None, tanınıb müştəri tapılmasa (və ya token uyğun gəlməsə) boş
+        recordset, əks halda müştərini qaytarır.
+        """
+        partner_id, token = self._parse_qr_payload(payload)
+        if partner_id is None and token is None:
+            return None
+        partner = self.browse()
+        if token:
+            try:
+                token_partner_id = self._get_partner_id_by_qr_token(token)
+            except KeyError:
+                return partner
+            # URL-dəki pid token ilə uyğun gəlməlidir
+            if partner_id and partner_id != token_partner_id:
+                return partner
+            return self.browse(token_partner_id).exists()
+        return self.browse(partner_id).exists()
+
     @api.constrains('mobile', 'birth_date')
     def _check_duplicate_contact(self):
         """Eyni mobil nömrəsi və doğum tarixi olan kontaktın olmasını yoxlayır"""
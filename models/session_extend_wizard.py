@@ -6,16 +6,33 @@ class BadmintonSessionExtendWizard(models.TransientModel):
     _name = 'badminton.session.extend.wizard'
     _description = 'Sessiya Uzatma Sihirbazı'
 
-    session_id = fields.Many2one('badminton.session', string="Sessiya", required=True)
+    session_id = fields.Many2one('badminton.session', string="Sessiya")
+    session_ids = fields.Many2many('badminton.session', string="Sessiyalar",
+                                   domain="[('state', 'in', ['active', 'extended'])]",
+                                   default=lambda self: self._default_session_ids())
+    session_count = fields.Integer(string="Sessiya Sayı", compute='_compute_session_count')
     partner_id = fields.Many2one(related='session_id.partner_id', string="Müştəri", readonly=True)
     current_balance = fields.Integer(related='partner_id.badminton_balance', string="Mövcud Balans", readonly=True)
     monthly_balance_hours = fields.Float(related='partner_id.monthly_balance_hours', string="Aylıq Balans (saat)", readonly=True)
     extend_hours = fields.Float(string="Uzatma Saatı", default=1.0, required=True)
 
+    @api.model
+    def _default_session_ids(self):
+        """Siyahıdan seçilmiş sessiyalar (məs. bütün kort qrupu)"""
+        if self.env.context.get('active_model') == 'badminton.session':
+            return [(6, 0, self.env.context.get('active_ids') or [])]
+        return False
+
+    @api.depends('session_ids', 'session_id')
+    def _compute_session_count(self):
+        for wizard in self:
+            wizard.session_count = len(wizard.session_ids | wizard.session_id)
+
     def extend_session(self):
-        """Sessiyanı seçilən saat qədər uzat"""
-        if self.session_id and self.extend_hours > 0:
-            self.session_id.extend_session(self.extend_hours)
+        """Seçilən sessiyaları seçilən saat qədər birlikdə uzat"""
+        sessions = self.session_ids | self.session_id
+        if sessions and self.extend_hours > 0:
+            sessions.extend_session(self.extend_hours)
             return {
                 'type': 'ir.actions.client',
                 'tag': 'reload'
@@ -0,0 +1,105 @@
+/** @odoo-module **/
+
+import { Component, onWillStart, onWillUnmount, useState } from "@odoo/owl";
+import { browser } from "@web/core/browser/browser";
+import { deserializeDateTime } from "@web/core/l10n/dates";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+
+const { DateTime } = luxon;
+
+/**
+ * Resepsiya ekranı: sessiyalar bir dəfə yüklənir (get_reception_snapshot), sonra
+ * 'volan_badminton_session/delta' bus hadisələri ilə yenilənir. Qalan vaxt brauzerdə
+ * end_time-dan hesablanır, ona görə açıq ekranların sayı serverə yük vermir. Hadisələr
+ * resepsiya qruplarının kanalına gəlir (üzvlər avtomatik qoşulur), əlavə kanal açılmır.
+ */
+export class BadmintonReceptionBoard extends Component {
+    static template = "volan_yasamal.BadmintonReceptionBoard";
+    static props = ["*"];
+
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        this.busService = useService("bus_service");
+        this.state = useState({ sessions: {}, occupancy: {}, now: DateTime.now() });
+
+        onWillStart(() => this.loadSnapshot());
+
+        this.onDelta = (payload) => this.applyDelta(payload);
+        this.onReconnect = () => this.loadSnapshot();
+        this.busService.subscribe("volan_badminton_session/delta", this.onDelta);
+        this.busService.addEventListener("reconnect", this.onReconnect);
+        const interval = browser.setInterval(() => (this.state.now = DateTime.now()), 15000);
+
+        onWillUnmount(() => {
+            this.busService.unsubscribe("volan_badminton_session/delta", this.onDelta);
+            this.busService.removeEventListener("reconnect", this.onReconnect);
+            browser.clearInterval(interval);
+        });
+    }
+
+    async loadSnapshot() {
+        const snapshot = await this.orm.call("badminton.session", "get_reception_snapshot", []);
+        this.state.sessions = Object.fromEntries(snapshot.sessions.map((session) => [session.id, session]));
+        this.state.occupancy = snapshot.occupancy;
+        this.state.now = DateTime.now();
+    }
+
+    applyDelta({ upsert, remove, occupancy }) {
+        for (const session of upsert) {
+            this.state.sessions[session.id] = session;
+        }
+        for (const sessionId of remove) {
+            delete this.state.sessions[sessionId];
+        }
+        this.state.occupancy = occupancy;
+    }
+
+    get activeSessions() {
+        return Object.values(this.state.sessions)
+            .filter((session) => session.state !== "draft")
+            .sort((a, b) => (a.end_time || "").localeCompare(b.end_time || ""));
+    }
+
+    get queue() {
+        return Object.values(this.state.sessions)
+            .filter((session) => session.state === "draft")
+            .sort((a, b) => a.created_at.localeCompare(b.created_at) || a.id - b.id);
+    }
+
+    get isFull() {
+        return this.state.occupancy.active >= this.state.occupancy.capacity;
+    }
+
+    formatTime(value) {
+        return value ? deserializeDateTime(value).toFormat("HH:mm") : "";
+    }
+
+    remainingMinutes(session) {
+        if (!session.end_time) {
+            return 0;
+        }
+        return Math.floor(deserializeDateTime(session.end_time).diff(this.state.now, "minutes").minutes);
+    }
+
+    rowClass(session) {
+        const remaining = this.remainingMinutes(session);
+        if (remaining <= 0) {
+            return "table-danger";
+        }
+        return remaining <= 5 ? "table-warning" : "";
+    }
+
+    openSession(sessionId) {
+        this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: "badminton.session",
+            res_id: sessionId,
+            views: [[false, "form"]],
+            target: "current",
+        });
+    }
+}
+
+registry.category("actions").add("volan_badminton_reception_board", BadmintonReceptionBoard);
@@ -0,0 +1,23 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+
+/**
+ * Sessiya bitmə xəbərdarlıqları: server hər cron işində nəzarətçi/admin qruplarının bus
+ * kanalına bir hadisə göndərir (badminton.session.cron_send_session_warnings). Qrup üzvləri
+ * kanala avtomatik qoşulur, ona görə klientdə kanal əlavə etmək və ya yoxlamaq lazım deyil.
+ */
+export const badmintonSessionWarningService = {
+    dependencies: ["bus_service", "notification"],
+
+    start(env, { bus_service, notification }) {
+        bus_service.subscribe("volan_badminton_session/warning", ({ warnings }) => {
+            const lines = warnings.map(
+                (warning) => `${warning.partner_name} üçün sessiyanın bitməsinə ${warning.minutes_left} dəqiqə qaldı.`
+            );
+            notification.add(lines.join("\n"), { title: "Sessiya bitir", type: "warning", sticky: true });
+        });
+    },
+};
+
+registry.category("services").add("volan_badminton_session_warning", badmintonSessionWarningService);
@@ -0,0 +1,30 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+
+/**
+ * Kassa dashboard-ı arxa fonda hesablandıqda (volan.cash.dashboard.snapshot)
+ * server bus ilə bildiriş göndərir: açıq forma həmin qeydə aiddirsə yenilənir.
+ */
+export const cashDashboardRefreshService = {
+    dependencies: ["bus_service", "action", "notification"],
+
+    start(env, { bus_service, action, notification }) {
+        bus_service.subscribe("volan_cash_dashboard/updated", (payload) => {
+            const props = action.currentController?.props;
+            if (payload.error) {
+                notification.add("Kassa hesabatı yenilənə bilmədi, zəhmət olmasa yenidən cəhd edin.", {
+                    type: "danger",
+                });
+            }
+            if (props && props.resModel === payload.model && props.resId === payload.res_id) {
+                action.doAction("soft_reload");
+            } else if (!payload.error) {
+                notification.add(`Kassa hesabatı yeniləndi (${payload.computed_at})`, { type: "success" });
+            }
+        });
+        bus_service.start();
+    },
+};
+
+registry.category("services").add("volan_cash_dashboard_refresh", cashDashboardRefreshService);